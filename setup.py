@@ -23,7 +23,8 @@ requires = [
     "requests",
     "us",
     "pandas",
-    "shapely",
+    "numpy",
+    "shapely>=2.0",
     "folium",
     "branca",
     "pyshp",
@@ -55,6 +56,6 @@ setuptools.setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     project_urls={"Source": "https://github.com/bluebonnet-data/bbd"},
 )
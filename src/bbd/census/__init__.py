@@ -1,9 +1,14 @@
 from .get_shapefile import get_shapefile
 from .geography import Geography
 from .datasets import DataSets
-from .load import load_json_file, load_json_str
-from .get_acs import get_acs, construct_api_call
+from .load import load_json_file, load_json_str, load_json_stream
+from .get_acs import get_acs, construct_api_call, acs_memo
 from .api_key import api_key
+from .summary_file import get_acs_summary_file, load_summary_file
+from .aggregate import aggregate
+from .time_series import get_acs_series
+from .decennial import get_decennial, get_blocks
+from .variables import VariableIndex, explore_acs
 
 __all__ = [
     get_shapefile,
@@ -11,7 +16,17 @@ __all__ = [
     DataSets,
     load_json_file,
     load_json_str,
+    load_json_stream,
     get_acs,
     construct_api_call,
+    acs_memo,
+    get_acs_series,
+    aggregate,
+    get_acs_summary_file,
+    load_summary_file,
+    get_decennial,
+    get_blocks,
     api_key,
+    VariableIndex,
+    explore_acs,
 ]
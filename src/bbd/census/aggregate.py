@@ -0,0 +1,92 @@
+"""Aggregation of acs estimates and their margins of error.
+
+Estimates are summed and margins of error are combined as the square root of
+the sum of their squares, as recommended by the census bureau:
+    https://www.census.gov/content/dam/Census/library/publications/2018/acs/acs_general_handbook_2018_ch08.pdf
+"""
+
+import re
+from typing import Optional, List
+
+import numpy as np
+import pandas as pd
+
+from ..gis.magic import Magic
+
+# Margin of error annotation for estimates that are controlled to official
+# counts. There is no sampling error, so the margin of error is 0.
+CONTROLLED_MOE = -555555555
+
+# Estimate columns of the acs api, e.g. "B01003_001E" or "S0101_C01_001E"
+# (but not "NAME")
+_ESTIMATE = re.compile(r"[A-Z0-9]+(?:_[A-Z0-9]+)*_\d+E")
+
+
+def aggregate(
+    data: dict,
+    join_on: str,
+    mapping: dict,
+    variables: Optional[List[str]] = None,
+    group_name: str = "group",
+) -> dict:
+    """Aggregate acs estimates (and margins of error) into groups of rows.
+
+    :param data: columns as returned by `get_acs`
+    :param join_on: the column of `data` used to look rows up in `mapping`
+    :param mapping: dict of {join_on value: group}, e.g. block group GEOID to
+        precinct name. Rows that are not in the mapping are dropped.
+    :param variables: estimate columns to aggregate (e.g. "B01003_001E").
+        Defaults to every estimate column (e.g. not "NAME"). For each estimate column the
+        matching margin of error column ("B01003_001M") is also aggregated if
+        it is in `data`.
+    :param group_name: name of the group column in the result
+
+    Returns columns with one row per group (sorted):
+        {group_name: [...], "B01003_001E": [...], "B01003_001M": [...]}
+
+    Missing values (`Magic.MISSING_VALUES`) make the aggregate for their
+    group missing (None), except for margins of error that only indicate a
+    controlled estimate, which count as 0.
+    """
+
+    if variables is None:
+        variables = [h for h in data if _ESTIMATE.fullmatch(h) and h != join_on]
+
+    moes = [v[:-1] + "M" for v in variables if v[:-1] + "M" in data]
+
+    df = pd.DataFrame(
+        {h: _to_numeric(data[h], is_moe=h in moes) for h in variables + moes}
+    )
+    groups = pd.Series(data[join_on]).map(mapping)
+
+    # Drop unmapped rows
+    keep = groups.notna().to_numpy()
+    df = df[keep]
+    groups = groups[keep]
+
+    grouped_missing = df.isna().groupby(groups.to_numpy()).any()
+
+    totals = df[variables].groupby(groups.to_numpy()).sum()
+    for m in moes:
+        totals[m] = np.sqrt((df[m] ** 2).groupby(groups.to_numpy()).sum())
+
+    d = {group_name: totals.index.tolist()}
+    for h in variables + moes:
+        d[h] = [
+            None if missing else value
+            for value, missing in zip(totals[h].tolist(), grouped_missing[h].tolist())
+        ]
+
+    return d
+
+
+def _to_numeric(values: list, is_moe: bool = False) -> pd.Series:
+    """Convert census values to floats, with missing values as NaN"""
+
+    s = pd.to_numeric(pd.Series(values, dtype=object), errors="raise").astype(float)
+
+    if is_moe:
+        s = s.mask(s == CONTROLLED_MOE, 0.0)
+
+    missing = [v for v in Magic.MISSING_VALUES if v is not None]
+    return s.mask(s.isin(missing))
@@ -0,0 +1,62 @@
+"""Binary cache for organized census columns.
+
+`get_acs` caches responses as compressed NumPy archives (.npz) instead of the
+raw JSON text. Each column is stored as a fixed-width unicode array, so a cache
+hit is a single decompress-and-copy rather than a JSON parse followed by
+`organize`.
+"""
+
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+
+def save_columns(fp: Union[Path, str], columns: dict) -> None:
+    """Save a dict of equal length columns, as returned by `organize`, to `fp`
+
+    Null values are stored separately from the column values so that the
+    columns can be kept as plain unicode arrays (no pickling required).
+    """
+
+    arrays = {"headers": np.array(list(columns.keys()), dtype=str)}
+
+    for n, values in enumerate(columns.values()):
+        nulls = [i for i, v in enumerate(values) if v is None]
+        arrays[f"c{n}"] = np.array(
+            ["" if v is None else str(v) for v in values], dtype=str
+        )
+        if nulls:
+            arrays[f"n{n}"] = np.array(nulls, dtype=np.int64)
+
+    # np.savez_compressed appends ".npz" to names without it, so write to an
+    # open file handle to keep the exact file name.
+    with open(fp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+def load_columns(fp: Union[Path, str], headers: list = None) -> dict:
+    """Load columns previously saved with `save_columns`
+
+    If `headers` is provided, only those columns are loaded.
+    """
+
+    with np.load(fp, allow_pickle=False) as archive:
+        all_headers = archive["headers"].tolist()
+
+        if headers is None:
+            headers = all_headers
+
+        d = {}
+        for h in headers:
+            n = all_headers.index(h)
+            values = archive[f"c{n}"].tolist()
+
+            # Restore null values
+            if f"n{n}" in archive.files:
+                for i in archive[f"n{n}"].tolist():
+                    values[i] = None
+
+            d[h] = values
+
+    return d
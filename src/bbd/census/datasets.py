@@ -5,3 +5,8 @@ class DataSets:
     ACS5_SUBJECT = "acs/acs5/subject"
     ACS5_PROFILE = "acs/acs5/profile"
     ACS5_CPROFILE = "acs/acs5/cprofile"
+
+    # Decennial census
+    DEC_PL = "dec/pl"  # Redistricting data (P.L. 94-171)
+    DEC_SF1 = "dec/sf1"  # Summary file 1 (2000, 2010)
+    DEC_DHC = "dec/dhc"  # Demographic and housing characteristics (2020)
@@ -0,0 +1,84 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, List
+
+from .geography import Geography
+from .datasets import DataSets
+from .get_acs import get_acs
+
+
+def get_decennial(
+    geography: Geography,
+    variables: Union[str, List[str]],
+    year: Union[str, int] = 2020,
+    dataset: DataSets = DataSets.DEC_PL,
+    state: Union[str, None] = None,
+    county: Union[str, None] = None,
+    cache: bool = False,
+    stream: bool = False,
+):
+    """Get decennial census data, e.g. the P.L. 94-171 redistricting data.
+
+    The decennial census api works the same way as the acs api, see `get_acs`.
+    """
+    return get_acs(geography, variables, year, dataset, state, county, cache, stream)
+
+
+def get_blocks(
+    variables: Union[str, List[str]],
+    state: Union[str, int],
+    year: Union[str, int] = 2020,
+    dataset: DataSets = DataSets.DEC_PL,
+    cache: bool = True,
+    max_workers: int = 4,
+) -> dict:
+    """Get decennial census data for every block in a state.
+
+    The api only returns blocks one county at a time, so the counties are
+    requested concurrently (each streamed, and cached if `cache` is True) and
+    their columns are concatenated in county order.
+
+    Returns columns like `get_acs`:
+        {"P1_001N": [...], "state": [...], "county": [...], "tract": [...],
+         "block": [...]}
+    """
+
+    counties = get_acs(
+        Geography.COUNTY, "NAME", year, dataset, state=state, cache=cache
+    )["county"]
+
+    def get_county(county: str) -> dict:
+        # Not memoized: a whole state of blocks should not be kept in memory
+        return get_acs(
+            Geography.BLOCK,
+            variables,
+            year,
+            dataset,
+            state=state,
+            county=county,
+            cache=cache,
+            stream=True,
+            memoize=False,
+        )
+
+    d = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Counties are submitted in a window of 2 * max_workers and consumed
+        # in order, so at most that many counties are held in memory in
+        # addition to the result, while the workers stay busy behind a slow
+        # county.
+        remaining = iter(sorted(counties))
+        pending = deque()
+        while True:
+            for county in remaining:
+                pending.append(executor.submit(get_county, county))
+                if len(pending) >= 2 * max_workers:
+                    break
+
+            if not pending:
+                break
+
+            for h, values in pending.popleft().result().items():
+                d.setdefault(h, []).extend(values)
+
+    return d
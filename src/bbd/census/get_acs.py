@@ -1,16 +1,27 @@
 import re
-from typing import Union, List
+from typing import Union, List, Optional
 
 import requests
 
 from ..working_directory import working_directory
+from ..warehouse import Warehouse
 
 from .geography import Geography
 from .datasets import DataSets
 from .api_key import api_key
-from .load import load_json_str, load_json_file
+from .load import load_json_str, load_json_file, load_json_stream
+from .cache import save_columns, load_columns
+from .memo import Memo
 from .us import state_to_fips
 
+"""In-process memo of recent `get_acs` results, holding at most 32 results and
+2 million values (e.g. not a national block group table)"""
+acs_memo = Memo(
+    maxsize=32,
+    maxcost=2_000_000,
+    cost=lambda columns: sum(len(values) for values in columns.values()),
+)
+
 
 def get_acs(
     geography: Geography,
@@ -20,14 +31,59 @@ def get_acs(
     state: Union[str, None] = None,
     county: Union[str, None] = None,
     cache: bool = False,
+    stream: bool = False,
+    memoize: bool = True,
+    warehouse: Optional[Warehouse] = None,
 ):
-    """Get census acs data"""
+    """Get census acs data
+
+    If `cache` is True, the organized columns are saved to a compressed binary
+    file in the `working_directory` and re-used on subsequent calls.
+
+    If `stream` is True, the response is parsed incrementally as it arrives
+    instead of being read into memory in full first. Use this for very large
+    requests (e.g. every block group in the country).
+
+    If `memoize` is True (the default), results are also kept in memory (see
+    `acs_memo`) and identical calls, including concurrent calls from other
+    threads, share a single fetch. Large results are not kept, so memory stays
+    bounded by the size of `acs_memo`. Set `memoize` to False for pulls that
+    should not be kept at all.
+
+    If a `warehouse` is given, the result is also written to it.
+    """
     call = construct_api_call(geography, variables, year, dataset, state, county)
 
-    save_file = working_directory.resolve(url_to_filename(call)).with_suffix(".json")
+    if memoize:
+        content = acs_memo.get((call, cache), lambda: _fetch(call, cache, stream))
+
+        # Copy the columns so that callers cannot modify the memoized result
+        content = {h: list(values) for h, values in content.items()}
+    else:
+        content = _fetch(call, cache, stream)
+
+    if warehouse is not None:
+        warehouse.write_acs(content, dataset, year, geography)
+
+    return content
+
+
+def _fetch(call: str, cache: bool, stream: bool) -> dict:
+    """Get the organized response to a census api call, from the cache file
+    if allowed and available.
+    """
+
+    save_file = working_directory.resolve(url_to_filename(call)).with_suffix(".npz")
 
     if cache is True and save_file.exists() and save_file.is_file():
-        return load_json_file(save_file)
+        return load_columns(save_file)
+
+    # Caches written by older versions of bbd hold the raw json response
+    legacy_file = save_file.with_suffix(".json")
+    if cache is True and legacy_file.exists() and legacy_file.is_file():
+        content = load_json_file(legacy_file)
+        save_columns(save_file, content)
+        return content
 
     r = requests.get(call, stream=True)
     if not r.ok:
@@ -36,16 +92,24 @@ def get_acs(
             f"Status code: {r.status_code}; Call: {call}; Content: {r.content}"
         )
 
-    if "<html>" in r.text:
-        raise ValueError(
-            f"Census API returned html response -- expected json. Response: {r.text}"
-        )
+    if stream:
+        if "html" in r.headers.get("Content-Type", ""):
+            raise ValueError(
+                f"Census API returned html response -- expected json. Response: {r.text}"
+            )
+
+        content = load_json_stream(r.iter_content(chunk_size=2 ** 16))
 
-    content = load_json_str(r.content)
+    else:
+        if "<html>" in r.text:
+            raise ValueError(
+                f"Census API returned html response -- expected json. Response: {r.text}"
+            )
+
+        content = load_json_str(r.content)
 
     if cache is True:
-        with open(save_file, "w") as f:
-            f.write(r.text)
+        save_columns(save_file, content)
 
     return content
 
@@ -101,6 +165,10 @@ def construct_api_call(
     else:
         in_county = ""
 
+    # Blocks are nested in tracts, which must be included in the hierarchy
+    if geography == Geography.BLOCK and county is not None:
+        in_county += "&in=tract:*"
+
     # Census api call
     return (
         f"https://api.census.gov/data/{year}/{dataset}"
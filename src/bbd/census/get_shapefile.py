@@ -1,4 +1,4 @@
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 from urllib.parse import urljoin
 from pathlib import Path
 from zipfile import ZipFile
@@ -12,6 +12,10 @@ from ..working_directory import working_directory
 from .geography import Geography
 from .us import state_to_fips
 
+"""County level TIGER/Line address range features (ADDRFEAT), used for
+geocoding. Not a Geography of the census api."""
+ADDRESS_FEATURES = "address features"
+
 """Maps year to congressional district number"""
 CD = {
     2019: 116,
@@ -26,9 +30,10 @@ CD = {
 }
 
 
-def shapefile_urls(fips: str, year=2019) -> Dict[str, str]:
+def shapefile_urls(fips: str, year=2019, county: Optional[str] = None) -> Dict[str, str]:
     """Generates urls to shapefiles associated with a given fips code
-    on the census ftp site.
+    on the census ftp site. County level shapefiles (ADDRESS_FEATURES) are
+    only included if the 3 digit county fips code is given.
 
     Note that these urls may not work for every year.
     Note that these urls point to a zip file.
@@ -50,6 +55,11 @@ def shapefile_urls(fips: str, year=2019) -> Dict[str, str]:
         "block group": urljoin(base, f"BG/tl_{year}_{fips}_bg.zip"),
     }
 
+    if county is not None:
+        urls[ADDRESS_FEATURES] = urljoin(
+            base, f"ADDRFEAT/tl_{year}_{fips}{county}_addrfeat.zip"
+        )
+
     return urls
 
 
@@ -58,10 +68,13 @@ def get_shapefile(
     state: Union[int, str],
     year: int,
     cache: bool = False,
+    county: Union[int, str, None] = None,
 ) -> Path:
     """Download and extract a census shapefile for a specified geography.
     Returns the name of the extracted directory.
 
+    County level shapefiles (ADDRESS_FEATURES) require the county fips code.
+
     Shapefiles are also available directly from the US Census Bureau:
         https://www.census.gov/cgi-bin/geo/shapefiles/index.php
     """
@@ -69,7 +82,14 @@ def get_shapefile(
     fips = state_to_fips(state)
 
     # Get the shapefile URL
-    url = shapefile_urls(fips, year)[geography]
+    if county is not None:
+        county = str(county).zfill(3)
+    try:
+        url = shapefile_urls(fips, year, county)[geography]
+    except KeyError:
+        if geography == ADDRESS_FEATURES:
+            raise ValueError(f"A county is required for {ADDRESS_FEATURES}")
+        raise
 
     # Determine name of zip file
     zip_name = url.split("/")[-1]  # e.g. "tl_2019_us_cd.zip"
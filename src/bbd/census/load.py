@@ -1,4 +1,9 @@
+import codecs
 import json
+import re
+from typing import Iterable, Iterator
+
+_WHITESPACE = re.compile(r"\s*")
 
 
 def load_json_file(fp, headers: list = None) -> dict:
@@ -17,11 +22,73 @@ def load_json_str(s: str, headers: list = None) -> dict:
     return organize(data, headers)
 
 
-def organize(data: dict, headers: list = None) -> dict:
+def load_json_stream(chunks: Iterable[bytes], headers: list = None) -> dict:
+    """Extract column data for the requested headers from a json response
+    that arrives in chunks (e.g. `requests.Response.iter_content`)
+
+    Rows are parsed one at a time, so the full response text is never held
+    in memory.
+    """
+
+    return organize(iter_json_rows(chunks), headers)
+
+
+def iter_json_rows(chunks: Iterable[bytes]) -> Iterator[list]:
+    """Incrementally parse a json array of rows (a list of lists), yielding
+    each row as soon as it has been received in full.
+    """
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    buffer = ""
+    pos = 0
+    started = False
+
+    for chunk in chunks:
+        # Drop everything that has already been parsed
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break  # Need more data
+
+            # Outer array
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(
+                        f"Expected json array, got: {buffer[pos:pos + 100]}"
+                    )
+                started = True
+                pos += 1
+                continue
+
+            if buffer[pos] == ",":
+                pos += 1
+                continue
+
+            if buffer[pos] == "]":
+                return  # End of outer array
+
+            try:
+                row, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Row is incomplete, need more data
+
+            yield row
+
+    raise ValueError("Unexpected end of json array")
+
+
+def organize(data: Iterable[list], headers: list = None) -> dict:
     """Extract column data for the requested headers"""
 
+    rows = iter(data)
+
     # Top row is header row
-    all_headers = data[0]
+    all_headers = next(rows)
 
     # If there are no requested headers, get all of the data available.
     if headers is None:
@@ -34,7 +101,7 @@ def organize(data: dict, headers: list = None) -> dict:
     d = {h: [] for h in headers}
 
     # Pull out the requested data in each row
-    for row in data[1:]:  # Skip header row
+    for row in rows:  # Header row already consumed
 
         [d[h].append(row[i]) for h, i in zip(headers, indexes)]
 
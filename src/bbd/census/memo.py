@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from typing import Callable, Hashable, Optional
+
+
+class Memo:
+    """Thread-safe, in-process memo of recent results.
+
+    Concurrent requests for the same key are coalesced: the first caller
+    computes the result while the others wait for it (single-flight). At most
+    `maxsize` results are kept; the least recently used result is evicted
+    first.
+
+    If `maxcost` is given, the total `cost(result)` of the kept results (e.g.
+    their number of values) is also kept within it. Results that cost more
+    than `maxcost` on their own are returned but not kept.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 32,
+        maxcost: Optional[int] = None,
+        cost: Callable = lambda result: 1,
+    ):
+        self.maxsize = maxsize
+        self.maxcost = maxcost
+        self.cost = cost
+        self._costs = {}
+        self._results = OrderedDict()
+        self._in_flight = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable, compute: Callable):
+        """Return the result for `key`, calling `compute()` only if it is
+        neither memoized nor already being computed by another thread.
+        """
+
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        # Another thread is already computing this result, wait for it
+        if not is_owner:
+            return future.result()
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        result_cost = self.cost(result) if self.maxcost is not None else 0
+
+        with self._lock:
+            del self._in_flight[key]
+            if self.maxsize > 0 and (
+                self.maxcost is None or result_cost <= self.maxcost
+            ):
+                self._results[key] = result
+                self._costs[key] = result_cost
+                while len(self._results) > self.maxsize or (
+                    self.maxcost is not None and self.total_cost() > self.maxcost
+                ):
+                    evicted, _ = self._results.popitem(last=False)
+                    del self._costs[evicted]
+
+        future.set_result(result)
+        return result
+
+    def clear(self) -> None:
+        """Forget all memoized results"""
+        with self._lock:
+            self._results.clear()
+            self._costs.clear()
+
+    def total_cost(self) -> int:
+        """Total cost of the memoized results"""
+        return sum(self._costs.values())
+
+    def __len__(self) -> int:
+        return len(self._results)
@@ -0,0 +1,204 @@
+"""Load acs data from the census bureau's (table based) summary files.
+
+For large pulls, e.g. hundreds of variables for every block group in the
+country, downloading whole tables is much faster than making thousands of
+api calls. Files are listed at:
+    https://www2.census.gov/programs-surveys/acs/summary_file/
+
+Each table is a pipe delimited file with one row per geography, e.g.
+    GEO_ID|B01003_E001|B01003_M001
+    1500000US080010078011|1441|244
+"""
+
+import csv
+import logging
+import re
+from operator import itemgetter
+from pathlib import Path
+from typing import Union, List, Optional
+
+import requests
+
+from ..working_directory import working_directory
+
+from .geography import Geography
+from .us import state_to_fips
+
+"""Maps geography to summary level code"""
+SUMMARY_LEVELS = {
+    Geography.STATE: "040",
+    Geography.COUNTY: "050",
+    Geography.TRACT: "140",
+    Geography.BLOCKGROUP: "150",
+    Geography.CD: "500",
+    Geography.ZCTA: "860",
+}
+
+"""Geography columns (and their widths) encoded in the GEO_ID of each summary level"""
+GEO_ID_COLUMNS = {
+    "040": [("state", 2)],
+    "050": [("state", 2), ("county", 3)],
+    "140": [("state", 2), ("county", 3), ("tract", 6)],
+    "150": [("state", 2), ("county", 3), ("tract", 6), ("block group", 1)],
+    "500": [("state", 2), ("congressional district", 2)],
+    "860": [("zip code tabulation area", 5)],
+}
+
+_FILE_VARIABLE = re.compile(r"^(\w+)_([EM])(\d+)$")  # e.g. B01003_E001
+_API_VARIABLE = re.compile(r"^(\w+)_(\d+)([EM])$")  # e.g. B01003_001E
+
+
+def summary_file_url(table: str, year: Union[str, int], period: int = 5) -> str:
+    """Url to the summary file of an acs table (2021 and later)"""
+    return (
+        f"https://www2.census.gov/programs-surveys/acs/summary_file/{year}/"
+        f"table-based-SF/data/{period}YRData/acsdt{period}y{year}-{table.lower()}.dat"
+    )
+
+
+def get_summary_file(
+    table: str,
+    year: Union[str, int],
+    period: int = 5,
+    cache: bool = True,
+) -> Path:
+    """Download the summary file of an acs table to the `working_directory`.
+    Returns the path to the downloaded file.
+    """
+
+    url = summary_file_url(table, year, period)
+    save_to = working_directory.resolve(url.split("/")[-1])
+
+    if cache and save_to.exists() and save_to.is_file():
+        logging.debug(f"Using cached summary file: {save_to}")
+        return save_to
+
+    logging.info(f"Downloading summary file from: {url}; to: {save_to}")
+
+    r = requests.get(url, stream=True)
+    if not r.ok:
+        raise RuntimeError(f"Bad request. Status code: {r.status_code} Url: {url}")
+
+    # Write to a temporary file so that an interrupted download is not cached
+    partial = save_to.with_suffix(".partial")
+    with open(partial, "wb") as f:
+        for chunk in r.iter_content(chunk_size=2 ** 20):
+            f.write(chunk)
+    partial.replace(save_to)
+
+    return save_to
+
+
+def load_summary_file(
+    fp: Union[Path, str],
+    variables: Optional[List[str]] = None,
+    geography: Optional[Geography] = None,
+    state: Union[str, int, None] = None,
+) -> dict:
+    """Extract columns from a summary file, in the same form as `get_acs`.
+
+    :param variables: variables to load, named as in the api (e.g.
+        "B01003_001E") or as in the file ("B01003_E001"). Defaults to all.
+    :param geography: Optional. Only load rows of this geography. The
+        geography columns (e.g. "state", "county") are then also included.
+    :param state: Optional. Only load rows within this state.
+
+    Returns columns named as in the api:
+        {"GEO_ID": [...], "state": [...], ..., "B01003_001E": [...]}
+
+    The file is read one row at a time, so memory use is bounded by the size
+    of the selected columns.
+    """
+
+    summary_level = None if geography is None else SUMMARY_LEVELS[geography]
+    geo_columns = [] if summary_level is None else GEO_ID_COLUMNS[summary_level]
+
+    # Rows to load, e.g. summary level "150" and state "08"
+    state_fips = None
+    if state is not None:
+        if summary_level is None:
+            raise ValueError("A geography is required to filter by state")
+        if geo_columns[0][0] != "state":
+            raise ValueError(f"Cannot filter {geography} by state")
+        state_fips = state_to_fips(state)
+
+    with open(fp, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter="|")
+        file_headers = next(reader)
+        api_headers = [to_api_variable(h) for h in file_headers]
+
+        if variables is None:
+            variables = [h for h in api_headers if h != "GEO_ID"]
+        else:
+            variables = [to_api_variable(v) for v in variables]
+
+        try:
+            geo_index = api_headers.index("GEO_ID")
+            indexes = [api_headers.index(v) for v in variables]
+        except ValueError:
+            raise ValueError(
+                f"Requested variables {variables} are not all in the file {fp}. "
+                f"Found: {api_headers}"
+            )
+
+        get_values = itemgetter(*indexes) if indexes else lambda row: ()
+
+        d = {h: [] for h in ["GEO_ID", *[c for c, _ in geo_columns], *variables]}
+        columns = [d[v] for v in variables]
+
+        for row in reader:
+            geo_id = row[geo_index]
+            if summary_level is not None and geo_id[:3] != summary_level:
+                continue
+
+            # Geography columns follow "US". The characters before it
+            # differ, e.g. "1500000US..." but "5001800US..." (the 118th
+            # congress) or "860Z200US..."
+            start = geo_id.find("US", 3) + 2
+            if state_fips is not None and geo_id[start : start + 2] != state_fips:
+                continue
+
+            d["GEO_ID"].append(geo_id)
+
+            # e.g. "1500000US080010078011" -> "08", "001", "007801", "1"
+            for c, width in geo_columns:
+                d[c].append(geo_id[start : start + width])
+                start += width
+
+            values = get_values(row)
+            if len(indexes) == 1:
+                values = (values,)
+            for column, v in zip(columns, values):
+                column.append(v if v != "" else None)
+
+    return d
+
+
+def get_acs_summary_file(
+    table: str,
+    geography: Geography,
+    year: Union[str, int],
+    variables: Optional[List[str]] = None,
+    state: Union[str, int, None] = None,
+    period: int = 5,
+    cache: bool = True,
+) -> dict:
+    """Get acs data for a whole table from its summary file instead of the
+    api. See `load_summary_file`.
+    """
+
+    fp = get_summary_file(table, year, period, cache)
+    return load_summary_file(fp, variables, geography, state)
+
+
+def to_api_variable(name: str) -> str:
+    """Convert summary file variable names to api names,
+    e.g. "B01003_E001" -> "B01003_001E"
+    """
+
+    match = _FILE_VARIABLE.match(name)
+    if match is None or _API_VARIABLE.match(name):
+        return name
+
+    table, kind, number = match.groups()
+    return f"{table}_{number}{kind}"
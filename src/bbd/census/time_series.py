@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, List, Iterable
+
+from .geography import Geography
+from .datasets import DataSets
+from .get_acs import get_acs
+
+
+def get_acs_series(
+    geography: Geography,
+    variables: Union[str, List[str]],
+    years: Iterable[Union[str, int]],
+    dataset: DataSets = DataSets.ACS5_DETAIL,
+    state: Union[str, None] = None,
+    county: Union[str, None] = None,
+    cache: bool = True,
+    max_workers: int = 4,
+) -> dict:
+    """Get the same census acs variables for several years.
+
+    Years are fetched concurrently. With `cache` True (the default) each year
+    is cached in the `working_directory`, so later calls only request the
+    years that have not been fetched before.
+
+    Returns columns with one row per year and geography:
+        {"year": [...], "state": [...], ..., "B01003_001E": [...], ...}
+
+    Rows are sorted by year and then by geography. Every year contains the
+    same geographies; values are None for geographies missing from a year.
+    """
+
+    if isinstance(variables, str):
+        variables = variables.split(",")
+
+    years = sorted(int(y) for y in years)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            year: executor.submit(
+                get_acs, geography, variables, year, dataset, state, county, cache
+            )
+            for year in years
+        }
+        tables = {year: future.result() for year, future in futures.items()}
+
+    # Geography columns (e.g. "state", "county") are returned in addition to
+    # the requested variables.
+    geo_headers = []
+    for table in tables.values():
+        geo_headers += [h for h in table if h not in variables and h not in geo_headers]
+
+    # Index each year's rows by geography
+    rows_by_year = {}
+    for year, table in tables.items():
+        geo_keys = zip(*[table.get(h, [None] * _num_rows(table)) for h in geo_headers])
+        rows_by_year[year] = {key: n for n, key in enumerate(geo_keys)}
+
+    all_keys = sorted(
+        set().union(*rows_by_year.values()),
+        key=lambda key: tuple("" if k is None else k for k in key),
+    )
+
+    d = {h: [] for h in ["year", *geo_headers, *variables]}
+    for year in years:
+        table = tables[year]
+        rows = rows_by_year[year]
+
+        d["year"] += [year] * len(all_keys)
+        for n, h in enumerate(geo_headers):
+            d[h] += [key[n] for key in all_keys]
+        for h in variables:
+            values = table[h]
+            d[h] += [values[rows[key]] if key in rows else None for key in all_keys]
+
+    return d
+
+
+def _num_rows(table: dict) -> int:
+    return len(next(iter(table.values()), []))
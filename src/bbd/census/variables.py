@@ -0,0 +1,318 @@
+"""Searchable index of census variable metadata.
+
+The census api publishes the metadata for every dataset as `variables.json` and
+`groups.json`, e.g. https://api.census.gov/data/2018/acs/acs5/variables.json
+
+`VariableIndex` downloads these files once per year/dataset and stores them in
+a SQLite database (with a full text search table) in the `working_directory`.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Union, Optional
+
+import requests
+
+from ..working_directory import working_directory
+
+from .datasets import DataSets
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    year INTEGER NOT NULL,
+    dataset TEXT NOT NULL,
+    PRIMARY KEY (year, dataset)
+);
+CREATE TABLE IF NOT EXISTS variables (
+    year INTEGER NOT NULL,
+    dataset TEXT NOT NULL,
+    name TEXT NOT NULL,
+    label TEXT,
+    concept TEXT,
+    "group" TEXT,
+    predicate_type TEXT
+);
+CREATE INDEX IF NOT EXISTS variables_name ON variables (name);
+CREATE INDEX IF NOT EXISTS variables_group ON variables ("group");
+CREATE TABLE IF NOT EXISTS groups (
+    year INTEGER NOT NULL,
+    dataset TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS groups_name ON groups (name);
+CREATE VIRTUAL TABLE IF NOT EXISTS variables_fts USING fts5(
+    label, concept, content='variables'
+);
+"""
+
+_COLUMNS = ["name", "label", "concept", "group", "predicate_type", "year", "dataset"]
+
+
+def metadata_url(year: Union[str, int], dataset: DataSets, name: str) -> str:
+    """Url to a metadata file (e.g. "variables.json") for a dataset"""
+    return f"https://api.census.gov/data/{year}/{dataset}/{name}"
+
+
+class VariableIndex:
+    """Local, searchable index of census variables.
+
+    Results are returned as columns (like `get_acs`):
+        {"name": [...], "label": [...], "concept": [...], "group": [...], ...}
+
+    If `year` and/or `dataset` are given, queries are restricted to them unless
+    overridden in the individual query.
+
+    Example:
+
+        >>> index = VariableIndex()
+        >>> index.add(2018, DataSets.ACS5_DETAIL)
+        >>> index.search("median household income", year=2018)
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str, None] = None,
+        year: Union[str, int, None] = None,
+        dataset: Optional[DataSets] = None,
+    ):
+        if path is None:
+            path = "census_variables.sqlite"
+
+        self.path = working_directory.resolve(path)
+        self.year = year
+        self.dataset = dataset
+
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def is_indexed(self, year: Union[str, int], dataset: DataSets) -> bool:
+        """Whether the metadata for `year` and `dataset` is already indexed"""
+        row = self._conn.execute(
+            "SELECT 1 FROM datasets WHERE year = ? AND dataset = ?",
+            (int(year), dataset),
+        ).fetchone()
+        return row is not None
+
+    def add(self, year: Union[str, int], dataset: DataSets, cache: bool = True):
+        """Download and index the metadata for `year` and `dataset`.
+
+        If `cache` is True and the metadata is already indexed, nothing is
+        downloaded.
+        """
+
+        if cache and self.is_indexed(year, dataset):
+            return
+
+        metadata = {}
+        for name in ("variables.json", "groups.json"):
+            url = metadata_url(year, dataset, name)
+            r = requests.get(url)
+            if not r.ok:
+                raise ValueError(
+                    f"Bad request. Status code: {r.status_code}; Url: {url}"
+                )
+            metadata[name] = r.json()
+
+        self.add_metadata(
+            year, dataset, metadata["variables.json"], metadata["groups.json"]
+        )
+
+    def add_metadata(
+        self,
+        year: Union[str, int],
+        dataset: DataSets,
+        variables: dict,
+        groups: dict,
+    ) -> None:
+        """Index the (already loaded) contents of `variables.json` and
+        `groups.json` for `year` and `dataset`, replacing any existing entries.
+        """
+
+        year = int(year)
+
+        with self._conn:
+            self._delete(year, dataset)
+
+            self._conn.executemany(
+                'INSERT INTO variables (year, dataset, name, label, concept, "group", '
+                "predicate_type) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        year,
+                        dataset,
+                        name,
+                        v.get("label"),
+                        v.get("concept"),
+                        v.get("group"),
+                        v.get("predicateType"),
+                    )
+                    for name, v in variables["variables"].items()
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO groups (year, dataset, name, description) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    (year, dataset, g["name"], g.get("description"))
+                    for g in groups["groups"]
+                ),
+            )
+            self._conn.execute(
+                "INSERT INTO variables_fts (rowid, label, concept) "
+                "SELECT rowid, label, concept FROM variables "
+                "WHERE year = ? AND dataset = ?",
+                (year, dataset),
+            )
+            self._conn.execute(
+                "INSERT INTO datasets (year, dataset) VALUES (?, ?)", (year, dataset)
+            )
+
+    def _delete(self, year: int, dataset: DataSets) -> None:
+        """Remove any entries for `year` and `dataset`"""
+
+        # External content fts tables must be told exactly what is removed
+        self._conn.execute(
+            "INSERT INTO variables_fts (variables_fts, rowid, label, concept) "
+            "SELECT 'delete', rowid, label, concept FROM variables "
+            "WHERE year = ? AND dataset = ?",
+            (year, dataset),
+        )
+        for table in ("variables", "groups", "datasets"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE year = ? AND dataset = ?", (year, dataset)
+            )
+
+    def search(
+        self,
+        text: str,
+        year: Union[str, int, None] = None,
+        dataset: Optional[DataSets] = None,
+        limit: int = 100,
+    ) -> dict:
+        """Variables whose label or concept contain every word in `text`,
+        best matches first.
+        """
+
+        # Quote each word so that it is not interpreted as fts query syntax
+        words = ['"' + w.replace('"', '""') + '"' for w in text.split()]
+        if not words:
+            return {c: [] for c in _COLUMNS}
+
+        where, params = self._filter(year, dataset, "v.")
+        return self._query(
+            "SELECT v.name, v.label, v.concept, v.\"group\", v.predicate_type, "
+            "v.year, v.dataset "
+            "FROM variables_fts JOIN variables v ON v.rowid = variables_fts.rowid "
+            f"WHERE variables_fts MATCH ?{where} "
+            "ORDER BY bm25(variables_fts) LIMIT ?",
+            [" ".join(words), *params, limit],
+        )
+
+    def lookup(
+        self,
+        name: str,
+        year: Union[str, int, None] = None,
+        dataset: Optional[DataSets] = None,
+    ) -> dict:
+        """Variables named `name` (e.g. "B19013_001E")"""
+
+        where, params = self._filter(year, dataset)
+        return self._query(
+            f'SELECT {", ".join(_quoted(_COLUMNS))} FROM variables '
+            f"WHERE name = ?{where} ORDER BY year, dataset",
+            [name, *params],
+        )
+
+    def group(
+        self,
+        group: str,
+        year: Union[str, int, None] = None,
+        dataset: Optional[DataSets] = None,
+    ) -> dict:
+        """Variables in the group (table) `group` (e.g. "B19013")"""
+
+        where, params = self._filter(year, dataset)
+        return self._query(
+            f'SELECT {", ".join(_quoted(_COLUMNS))} FROM variables '
+            f'WHERE "group" = ?{where} ORDER BY year, dataset, name',
+            [group, *params],
+        )
+
+    def groups(
+        self,
+        year: Union[str, int, None] = None,
+        dataset: Optional[DataSets] = None,
+    ) -> dict:
+        """All indexed groups (tables) and their descriptions"""
+
+        where, params = self._filter(year, dataset)
+        cursor = self._conn.execute(
+            "SELECT name, description, year, dataset FROM groups "
+            f"WHERE 1 = 1{where} ORDER BY year, dataset, name",
+            params,
+        )
+        return _columns(cursor, ["name", "description", "year", "dataset"])
+
+    def _filter(self, year, dataset, prefix: str = ""):
+        """SQL condition and parameters restricting results to year/dataset"""
+
+        year = self.year if year is None else year
+        dataset = self.dataset if dataset is None else dataset
+
+        where = ""
+        params = []
+        if year is not None:
+            where += f" AND {prefix}year = ?"
+            params.append(int(year))
+        if dataset is not None:
+            where += f" AND {prefix}dataset = ?"
+            params.append(dataset)
+
+        return where, params
+
+    def _query(self, sql: str, params: list) -> dict:
+        return _columns(self._conn.execute(sql, params), _COLUMNS)
+
+
+def _quoted(columns: list) -> list:
+    return [f'"{c}"' for c in columns]
+
+
+def _columns(cursor, headers: list) -> dict:
+    """Organize cursor rows into columns"""
+
+    d = {h: [] for h in headers}
+    for row in cursor:
+        [d[h].append(v) for h, v in zip(headers, row)]
+    return d
+
+
+def explore_acs(
+    year: Union[str, int] = 2018,
+    dataset: DataSets = DataSets.ACS5_DETAIL,
+    cache: bool = True,
+) -> VariableIndex:
+    """Explore the variables available in an acs dataset.
+
+    Returns a `VariableIndex` restricted to `year` and `dataset`, downloading
+    the metadata first if it is not already indexed.
+
+    Example:
+
+        >>> variables = explore_acs(2018)
+        >>> variables.search("income")
+    """
+
+    index = VariableIndex(year=year, dataset=dataset)
+    index.add(year, dataset, cache)
+    return index
@@ -1,6 +1,18 @@
 from .api_key import api_key
 from .get_fec import get_fec, construct_api_call
-from .utilities import fec_counter, get_next_page, get_all_results
+from .utilities import (
+    fec_counter,
+    get_next_page,
+    get_all_results,
+    iter_results,
+    iter_pages,
+    write_all_results,
+    Throttle
+)
+from .sharded import get_sharded_results, date_shards
+from .bulk import iter_bulk_file, load_bulk_file
+from .aggregate import FecAggregator, aggregate_results
+from .districts import assign_districts
 
 __all__ = [
     api_key,
@@ -8,5 +20,16 @@ __all__ = [
     construct_api_call,
     fec_counter,
     get_next_page,
-    get_all_results
+    get_all_results,
+    iter_results,
+    iter_pages,
+    write_all_results,
+    Throttle,
+    get_sharded_results,
+    date_shards,
+    iter_bulk_file,
+    load_bulk_file,
+    FecAggregator,
+    aggregate_results,
+    assign_districts
 ]
@@ -0,0 +1,164 @@
+"""Columnar aggregation of FEC receipts (or other itemized records), e.g. the
+total amount raised per committee and state per month. Records can be added
+one page or chunk at a time, as they are streamed by iter_results or
+iter_bulk_file."""
+
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+"""Pandas period frequency for each date bucket"""
+DATE_BUCKETS = {
+    "day": "D",
+    "week": "W",
+    "month": "M",
+    "quarter": "Q",
+    "year": "Y",
+}
+
+
+class FecAggregator:
+    """Incrementally computes the count, sum and (optionally) median of an
+    amount field, grouped by one or more fields.
+
+    by: fields to group by, e.g. ["committee_id", "contributor_state"].
+        "contributor_zip5" groups by the first 5 digits of "contributor_zip".
+    date_bucket: Optional. One of "day", "week", "month", "quarter" or "year"
+        to also group by the period of the `date` field, as a "period" column.
+    median: the median requires keeping every (non missing) amount, with an
+        integer code of its group: 12 bytes per record. Set to False to only
+        keep running counts and sums.
+
+    Example:
+
+        >>> aggregator = FecAggregator(["committee_id"], date_bucket="month")
+        >>> for page in iter_results("schedules/schedule_a", params, batched=True):
+        ...     aggregator.update(page)
+        >>> aggregator.result()
+        {"committee_id": [...], "period": [...], "count": [...], "sum": [...],
+         "median": [...]}
+    """
+
+    # Partial sums are merged once this many have accumulated
+    _max_partials = 32
+
+    def __init__(
+        self,
+        by: Union[str, List[str]],
+        amount: str = "contribution_receipt_amount",
+        date: str = "contribution_receipt_date",
+        date_bucket: Optional[str] = None,
+        median: bool = True
+    ):
+        if isinstance(by, str):
+            by = [by]
+        if date_bucket is not None and date_bucket not in DATE_BUCKETS:
+            raise ValueError(
+                f"Unknown date_bucket: {date_bucket}. Use one of {list(DATE_BUCKETS)}")
+
+        self.by = list(by)
+        self.amount = amount
+        self.date = date
+        self.date_bucket = date_bucket
+        self.median = median
+
+        self.columns = self.by + (["period"] if date_bucket is not None else [])
+
+        self._partials = []
+
+        # For the median: amounts and their group codes, one array per update
+        self._group_codes = {}
+        self._amounts = []
+        self._codes = []
+
+    def update(self, records: Union[List[dict], pd.DataFrame]) -> "FecAggregator":
+        """Adds records (e.g. one page of 'results') to the aggregates"""
+
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+        if df.empty:
+            return self
+
+        frame = pd.DataFrame(index=df.index)
+        for column in self.by:
+            if column == "contributor_zip5":
+                frame[column] = df["contributor_zip"].astype("string").str[:5]
+            else:
+                frame[column] = df[column]
+        if self.date_bucket is not None:
+            frame["period"] = (
+                pd.to_datetime(df[self.date], errors="coerce")
+                .dt.to_period(DATE_BUCKETS[self.date_bucket])
+                .astype("string")
+            )
+        frame["amount"] = pd.to_numeric(df[self.amount], errors="coerce")
+
+        grouped = frame.groupby(self.columns, dropna=False)
+        partial = grouped["amount"].agg(["count", "sum"])
+        self._partials.append(partial)
+        if len(self._partials) >= self._max_partials:
+            self._partials = [self._merged_partials()]
+
+        if self.median:
+            # Groups are numbered in the same (sorted) order as `partial`
+            codes = np.array(
+                [self._group_code(key) for key in partial.index], dtype=np.int32
+            )[grouped.ngroup().to_numpy()]
+            amounts = frame["amount"].to_numpy(dtype=float)
+            keep = ~np.isnan(amounts)
+            self._codes.append(codes[keep])
+            self._amounts.append(amounts[keep])
+
+        return self
+
+    def _group_code(self, key) -> int:
+        return self._group_codes.setdefault(_group_key(key), len(self._group_codes))
+
+    def _merged_partials(self) -> pd.DataFrame:
+        levels = list(range(len(self.columns)))
+        return pd.concat(self._partials).groupby(level=levels, dropna=False).sum()
+
+    def result(self) -> dict:
+        """Returns the aggregates as columns, one row per group (sorted):
+            {<by fields>..., "count": [...], "sum": [...], "median": [...]}"""
+
+        headers = self.columns + ["count", "sum"] + (["median"] if self.median else [])
+        if not self._partials:
+            return {h: [] for h in headers}
+
+        totals = self._merged_partials().sort_index()
+        if self.median:
+            medians = (
+                pd.Series(np.concatenate(self._amounts))
+                .groupby(np.concatenate(self._codes))
+                .median()
+            )
+            totals["median"] = [
+                medians.get(self._group_codes.get(_group_key(key)))
+                for key in totals.index
+            ]
+
+        totals = totals.reset_index()
+        totals["count"] = totals["count"].astype(int)
+        totals = totals.astype(object).where(totals.notna(), None)
+        return {h: totals[h].tolist() for h in headers}
+
+
+def _group_key(key) -> tuple:
+    """Group key as a tuple, with missing values as None"""
+    key = key if isinstance(key, tuple) else (key,)
+    return tuple(None if pd.isna(v) else v for v in key)
+
+
+def aggregate_results(
+    records: Iterable[Union[List[dict], pd.DataFrame]],
+    by: Union[str, List[str]],
+    **kwargs
+) -> dict:
+    """Aggregates an iterable of record batches (e.g. iter_results(...,
+    batched=True) or iter_bulk_file(...)). See FecAggregator for the arguments."""
+
+    aggregator = FecAggregator(by, **kwargs)
+    for batch in records:
+        aggregator.update(batch)
+    return aggregator.result()
@@ -0,0 +1,167 @@
+"""Loads FEC bulk data files (https://www.fec.gov/data/browse-data/?tab=bulk-data)
+as an alternative to paging through the OpenFEC API with get_fec. Bulk files
+are pipe delimited text files without a header row, usually distributed as zip
+files (e.g. indiv20.zip, which contains itcont.txt)."""
+
+import csv
+import io
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from ..working_directory import working_directory
+
+"""Columns of the individual contributions file, see
+https://www.fec.gov/campaign-finance-data/contributions-individuals-file-description/"""
+INDIVIDUAL_CONTRIBUTIONS = [
+    "CMTE_ID", "AMNDT_IND", "RPT_TP", "TRANSACTION_PGI", "IMAGE_NUM",
+    "TRANSACTION_TP", "ENTITY_TP", "NAME", "CITY", "STATE", "ZIP_CODE",
+    "EMPLOYER", "OCCUPATION", "TRANSACTION_DT", "TRANSACTION_AMT", "OTHER_ID",
+    "TRAN_ID", "FILE_NUM", "MEMO_CD", "MEMO_TEXT", "SUB_ID",
+]
+
+"""Names of bulk file columns in OpenFEC API (schedule_a) results"""
+API_NAMES = {
+    "CMTE_ID": "committee_id",
+    "AMNDT_IND": "amendment_indicator",
+    "RPT_TP": "report_type",
+    "TRANSACTION_PGI": "election_type",
+    "IMAGE_NUM": "image_number",
+    "TRANSACTION_TP": "receipt_type",
+    "ENTITY_TP": "entity_type",
+    "NAME": "contributor_name",
+    "CITY": "contributor_city",
+    "STATE": "contributor_state",
+    "ZIP_CODE": "contributor_zip",
+    "EMPLOYER": "contributor_employer",
+    "OCCUPATION": "contributor_occupation",
+    "TRANSACTION_DT": "contribution_receipt_date",
+    "TRANSACTION_AMT": "contribution_receipt_amount",
+    "OTHER_ID": "contributor_id",
+    "TRAN_ID": "transaction_id",
+    "FILE_NUM": "file_number",
+    "MEMO_CD": "memo_code",
+    "MEMO_TEXT": "memo_text",
+    "SUB_ID": "sub_id",
+}
+
+def iter_bulk_file(
+    path: Union[Path, str],
+    columns: Optional[List[str]] = None,
+    filters: Optional[dict] = None,
+    chunk_size: int = 100000,
+    header: List[str] = INDIVIDUAL_CONTRIBUTIONS,
+    member: Optional[str] = None,
+    as_frame: bool = False
+) -> Iterator[Union[List[dict], pd.DataFrame]]:
+    """Yields the records of a bulk file in chunks of `chunk_size` rows, in the
+    same shape as OpenFEC API results (e.g. {"committee_id": ..., "sub_id": ...}).
+    The file is streamed, straight from the zip file if it is one.
+
+    columns: API names of the fields to include. Defaults to all.
+    filters: dict of {API name: value}. Only records whose field equals the
+        value are kept. The value may also be a list/set (record's field is in
+        it) or a function taking a pandas Series and returning a boolean mask.
+        Filters apply to typed values, e.g.
+        {"contributor_state": ["CO", "TX"],
+         "contribution_receipt_amount": lambda amount: amount >= 200}
+    header: bulk file column names, in order. Defaults to the individual
+        contributions file.
+    member: name of the file to read within a zip file. Defaults to the
+        largest one.
+    as_frame: yield each chunk as a pandas DataFrame instead of a list of dicts.
+
+    Amounts are floats, dates are "YYYY-MM-DD" strings and empty fields are None."""
+
+    filters = filters or {}
+    names = [API_NAMES.get(h, h.lower()) for h in header]
+
+    if columns is None:
+        columns = names
+    unknown = [c for c in list(columns) + list(filters) if c not in names]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}. Available columns: {names}")
+
+    # Only parse the columns that are needed
+    usecols = [n for n in names if n in columns or n in filters]
+
+    with _open_text(working_directory.resolve(path), member) as f:
+        chunks = pd.read_csv(
+            f,
+            sep="|",
+            header=None,
+            names=names,
+            usecols=usecols,
+            dtype=str,
+            quoting=csv.QUOTE_NONE,
+            keep_default_na=False,
+            na_values=[""],
+            chunksize=chunk_size,
+        )
+        for chunk in chunks:
+            chunk = _typed(chunk)
+
+            for column, condition in filters.items():
+                chunk = chunk[_mask(chunk[column], condition)]
+
+            chunk = chunk[columns]
+            if as_frame:
+                yield chunk
+            else:
+                yield chunk.astype(object).where(chunk.notna(), None).to_dict("records")
+
+def load_bulk_file(
+    path: Union[Path, str],
+    columns: Optional[List[str]] = None,
+    filters: Optional[dict] = None,
+    header: List[str] = INDIVIDUAL_CONTRIBUTIONS,
+    member: Optional[str] = None
+) -> List[dict]:
+    """Returns all (matching) records of a bulk file as one list. See
+    iter_bulk_file."""
+
+    records = []
+    for chunk in iter_bulk_file(path, columns, filters, header=header, member=member):
+        records += chunk
+    return records
+
+@contextmanager
+def _open_text(path: Path, member: Optional[str]):
+    """Opens a bulk file for reading text, within a zip file if necessary"""
+
+    # Bulk files are not strictly utf-8; latin-1 accepts any byte
+    if not zipfile.is_zipfile(path):
+        with open(path, "r", encoding="latin-1", newline="") as f:
+            yield f
+        return
+
+    with zipfile.ZipFile(path) as z:
+        if member is None:
+            member = max(z.infolist(), key=lambda info: info.file_size).filename
+        with io.TextIOWrapper(z.open(member), encoding="latin-1", newline="") as f:
+            yield f
+
+def _typed(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Converts text columns to the types used in API results"""
+
+    if "contribution_receipt_amount" in chunk:
+        chunk["contribution_receipt_amount"] = pd.to_numeric(
+            chunk["contribution_receipt_amount"], errors="coerce")
+    if "contribution_receipt_date" in chunk:
+        chunk["contribution_receipt_date"] = pd.to_datetime(
+            chunk["contribution_receipt_date"], format="%m%d%Y", errors="coerce"
+        ).dt.strftime("%Y-%m-%d")
+    if "file_number" in chunk:
+        chunk["file_number"] = pd.to_numeric(
+            chunk["file_number"], errors="coerce").astype("Int64")
+    return chunk
+
+def _mask(values: pd.Series, condition: Union[Callable, list, set, tuple, object]) -> pd.Series:
+    if callable(condition):
+        return condition(values)
+    if isinstance(condition, (list, set, tuple, frozenset)):
+        return values.isin(condition)
+    return values == condition
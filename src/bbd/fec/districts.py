@@ -0,0 +1,103 @@
+"""Pipeline that assigns FEC contributors (e.g. schedule_a results) to
+districts: contributor addresses are deduplicated, each unique address is
+geocoded once (with progress saved to disk, see bbd.geocoder.LocationsGeocoder),
+and the coordinates are joined to district shapes with a spatial index."""
+
+from pathlib import Path
+from typing import List, Union
+
+import pandas as pd
+
+from ..working_directory import working_directory
+from ..geocoder import LocationsGeocoder
+from ..gis import assign_shapes
+
+"""Address components (as named by LocationsGeocoder) of FEC record fields"""
+ADDRESS_FIELDS = {
+    "Address": "contributor_street_1",
+    "City": "contributor_city",
+    "State": "contributor_state",
+    "Zip5": "contributor_zip",
+}
+
+def assign_districts(
+    records: Union[List[dict], pd.DataFrame],
+    geocoder,
+    shapefile_path: Union[Path, str],
+    record_key: str,
+    out_path: Union[Path, str],
+    geocode_path: Union[Path, str, None] = None,
+    district_field: str = "district",
+    chunk_size: int = 10000,
+    address_fields: dict = ADDRESS_FIELDS
+) -> Path:
+    """Geocodes the contributor addresses of FEC records and assigns each record
+    to the district (shape) containing it.
+
+    records: FEC records, e.g. from get_all_results or load_bulk_file.
+    geocoder: email address or geocoder, as accepted by LocationsGeocoder.
+    shapefile_path, record_key: district shapefile and the record field that
+        identifies each district (e.g. "GEOID").
+    out_path: CSV file (relative to the working directory) that the records are
+        written to, in chunks of `chunk_size` rows, with added "latitude",
+        "longitude" and `district_field` columns.
+    geocode_path: where geocoded unique addresses are saved. Defaults to a file
+        next to `out_path`. Re-running with the same file only geocodes
+        addresses that have not been geocoded yet.
+    address_fields: dict of {address component: record field}. Components
+        whose field is not in the records are skipped.
+
+    Returns the path to the written CSV file."""
+
+    df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+
+    out_path = working_directory.resolve(out_path)
+    if geocode_path is None:
+        geocode_path = out_path.with_name(out_path.stem + "_geocoded.tsv")
+    geocode_path = working_directory.resolve(geocode_path)
+
+    # Address components of each record
+    addresses = pd.DataFrame(index=df.index)
+    for component, field in address_fields.items():
+        if field in df:
+            values = df[field].astype("string").str.strip().str.upper()
+            if component.lower() in ("zip5", "zip", "postal"):
+                values = values.str[:5]
+            addresses[component] = values
+    if addresses.columns.empty:
+        raise ValueError(f"Records contain none of the address fields: {address_fields}")
+
+    # Geocode each unique address once
+    unique = addresses.drop_duplicates().dropna(how="all").reset_index(drop=True)
+    locations = LocationsGeocoder(unique, geocoder, geocode_path).run()
+    locations = locations.reindex(unique.index)
+
+    latitudes = pd.to_numeric(locations["latitude"], errors="coerce")
+    longitudes = pd.to_numeric(locations["longitude"], errors="coerce")
+    districts = pd.Series(
+        assign_shapes(latitudes.tolist(), longitudes.tolist(), shapefile_path, record_key),
+        index=unique.index,
+        dtype=object,
+    )
+
+    # Unique address of each record (NaN for records without an address)
+    columns = list(addresses.columns)
+    codes = addresses.merge(
+        unique.reset_index().rename(columns={"index": "_unique"}),
+        how="left",
+        on=columns,
+    )["_unique"].to_numpy()
+
+    # Write the enriched records in chunks
+    for start in range(0, max(len(df), 1), chunk_size):
+        chunk = df.iloc[start:start + chunk_size].copy()
+        chunk_codes = codes[start:start + chunk_size]
+
+        chunk["latitude"] = latitudes.reindex(chunk_codes).to_numpy()
+        chunk["longitude"] = longitudes.reindex(chunk_codes).to_numpy()
+        chunk[district_field] = districts.reindex(chunk_codes).to_numpy()
+
+        chunk.to_csv(out_path, mode="w" if start == 0 else "a",
+                     header=start == 0, index=False)
+
+    return out_path
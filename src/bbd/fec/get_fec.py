@@ -6,26 +6,34 @@ chosen endpoint as a string and the parameters they have chosen as a dict."""
 import json
 import re
 import requests
+from typing import Optional
 from urllib.parse import urlencode
 
 from ..working_directory import working_directory
+from ..warehouse import Warehouse
 
 from .api_key import api_key
 
 def get_fec(
     endpoint: str,
     params: dict,
-    cache: bool = False
+    cache: bool = False,
+    warehouse: Optional[Warehouse] = None
 ):
     """Get OpenFEC data. See https://api.open.fec.gov/developers for a list of
-    endpoints and the parameters associated with each endpoint."""
+    endpoints and the parameters associated with each endpoint.
+
+    If a warehouse is given, the page's results are also written to it."""
     call = construct_api_call(endpoint, params)
 
     save_file = working_directory.resolve(url_to_filename(call)).with_suffix(".json")
 
     if cache is True and save_file.exists() and save_file.is_file():
         with open(save_file, "r") as f:
-            return json.load(f)
+            content = json.load(f)
+        if warehouse is not None:
+            warehouse.write_fec(content.get("results", []), endpoint)
+        return content
 
     r = requests.get(call, stream=True)
     if not r.ok:
@@ -45,6 +53,9 @@ def get_fec(
         with open(save_file, "w") as f:
             f.write(r.text)
 
+    if warehouse is not None:
+        warehouse.write_fec(content.get("results", []), endpoint)
+
     return content
 
 def url_to_filename(url: str) -> str:
@@ -0,0 +1,102 @@
+"""Splits large OpenFEC queries into independent slices that can be paged
+through concurrently. Pagination within one query is sequential (each page's
+cursor comes from the previous page), but queries over disjoint date ranges or
+two-year periods are independent."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import product
+from typing import List, Optional, Tuple, Union
+
+from .utilities import Throttle, iter_pages
+
+def date_shards(
+    min_date: Union[str, date],
+    max_date: Union[str, date],
+    num_shards: int
+) -> List[Tuple[str, str]]:
+    """Splits the inclusive date range into (at most) `num_shards` inclusive,
+    non-overlapping ranges of whole days. Dates are "YYYY-MM-DD" strings."""
+
+    start = _to_date(min_date)
+    end = _to_date(max_date)
+    if end < start:
+        raise ValueError(f"max_date {max_date} is before min_date {min_date}")
+
+    num_days = (end - start).days + 1
+    num_shards = max(1, min(num_shards, num_days))
+
+    shards = []
+    for n in range(num_shards):
+        shard_start = start + timedelta(days=num_days * n // num_shards)
+        shard_end = start + timedelta(days=num_days * (n + 1) // num_shards - 1)
+        shards.append((shard_start.isoformat(), shard_end.isoformat()))
+    return shards
+
+def get_sharded_results(
+    endpoint: str,
+    params: dict,
+    min_date: Union[str, date, None] = None,
+    max_date: Union[str, date, None] = None,
+    num_shards: int = 8,
+    two_year_transaction_periods: Optional[List[int]] = None,
+    max_workers: int = 4,
+    throttle: Optional[Throttle] = None,
+    date_params: Tuple[str, str] = ("min_date", "max_date")
+) -> list:
+    """Gets the 'results' value from all pages of the data specified by the
+    arguments, like get_all_results, but split into independent slices that
+    are paged through concurrently.
+
+    The query is sliced by date (`min_date` to `max_date` in `num_shards`
+    ranges, sent as the `date_params`) and/or by two-year period (one slice
+    per value in `two_year_transaction_periods`). All slices share one
+    throttle, by default the rate limit of a standard API key.
+
+    Results are merged in slice order and deduplicated by 'sub_id'."""
+
+    if throttle is None:
+        throttle = Throttle()
+
+    date_ranges = [None]
+    if min_date is not None or max_date is not None:
+        if min_date is None or max_date is None:
+            raise ValueError("Both min_date and max_date are required to shard by date")
+        date_ranges = date_shards(min_date, max_date, num_shards)
+
+    periods = [None] if not two_year_transaction_periods else two_year_transaction_periods
+
+    shards = []
+    for date_range, period in product(date_ranges, periods):
+        shard_params = dict(params)
+        if date_range is not None:
+            shard_params[date_params[0]], shard_params[date_params[1]] = date_range
+        if period is not None:
+            shard_params["two_year_transaction_period"] = period
+        shards.append(shard_params)
+
+    def get_shard(shard_params):
+        results = []
+        for page in iter_pages(endpoint, shard_params, throttle=throttle):
+            results += page["results"]
+        return results
+
+    results = []
+    seen = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for shard_results in executor.map(get_shard, shards):
+            for result in shard_results:
+                sub_id = result.get("sub_id")
+                if sub_id is not None:
+                    if sub_id in seen:
+                        continue
+                    seen.add(sub_id)
+                results.append(result)
+    return results
+
+def _to_date(d: Union[str, date]) -> date:
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return datetime.strptime(d, "%Y-%m-%d").date()
@@ -2,10 +2,22 @@
 been downloaded by get_fec. Definitely more could be added here, these are
 just examples."""
 
+import json
+import os
+import queue
+import threading
+import time
 from collections import Counter
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from ..working_directory import working_directory
 
 from .get_fec import get_fec
 
+# Marks the end of the pages in iter_pages' queue
+_DONE = object()
+
 def fec_counter(
     fec_data: dict,
     metric: str
@@ -59,14 +71,173 @@ def get_all_results(
     params: dict
 ) -> list:
     """Gets the 'results' value from all pages of the data specified by the arguments
-    and returns one big list."""
+    and returns one big list. For large queries, use iter_results instead."""
+
+    return list(iter_results(endpoint, params))
+
+def iter_results(
+    endpoint: str,
+    params: dict,
+    batched: bool = False,
+    prefetch: int = 2
+) -> Iterator[Union[dict, list]]:
+    """Lazily yields each record in the 'results' value of all pages (including
+    the last) of the data specified by the arguments. If `batched` is True,
+    yields each page's list of records instead.
+
+    Pages are fetched ahead in the background (see iter_pages), so only a few
+    pages are held in memory at a time."""
+
+    for page in iter_pages(endpoint, params, prefetch=prefetch):
+        if batched:
+            yield page["results"]
+        else:
+            yield from page["results"]
+
+class Throttle:
+    """Spaces out calls to wait() so that at most `calls_per_hour` calls are
+    made per hour. Can be shared between threads. The default matches the rate
+    limit of a standard OpenFEC API key."""
+
+    def __init__(self, calls_per_hour: float = 1000):
+        self.interval = 3600 / calls_per_hour
+        self._next_call = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next call is allowed"""
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call)
+            self._next_call = call_at + self.interval
+        time.sleep(call_at - now)
+
+def iter_pages(
+    endpoint: str,
+    params: dict,
+    prefetch: int = 2,
+    throttle: Optional[Throttle] = None,
+    last_indexes: Optional[dict] = None
+) -> Iterator[dict]:
+    """Yields every page (including the last) of the data specified by the
+    arguments.
+
+    Pages are fetched on a background thread that requests page N+1 as soon as
+    page N's 'last_indexes' are known, so the network requests overlap with
+    whatever the caller does with each page. At most `prefetch` pages are
+    buffered. If a throttle is given, each request waits for it first.
+
+    Pass the 'last_indexes' of a previously fetched page to start from the page
+    after it."""
+
+    pages = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up if the consumer has stopped reading pages
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def wait():
+        if throttle is not None:
+            throttle.wait()
+
+    def fetch():
+        try:
+            wait()
+            page = get_fec(endpoint, {**params, **(last_indexes or {})})
+            while put(page):
+                # Stop after the last page
+                if page["pagination"]["last_indexes"] is None or not page["results"]:
+                    break
+                wait()
+                page = get_next_page(page, endpoint, params)
+            put(_DONE)
+        except Exception as e:
+            put(e)
+
+    fetcher = threading.Thread(target=fetch, daemon=True)
+    fetcher.start()
+
+    try:
+        while True:
+            item = pages.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+def write_all_results(
+    endpoint: str,
+    params: dict,
+    path: Union[Path, str],
+    resume: bool = False,
+    throttle: Optional[Throttle] = None
+) -> int:
+    """Writes the 'results' value from all pages of the data specified by the
+    arguments to `path` (relative to the working directory), one json record
+    per line. Only one page is held in memory at a time.
+
+    After each page, the page's 'last_indexes' cursor and the size of the
+    output are saved to a checkpoint file next to `path`. If `resume` is True
+    and a checkpoint exists, extraction continues after the last completed
+    page instead of starting over.
+
+    Returns the total number of records written."""
+
+    path = working_directory.resolve(path)
+    checkpoint_path = path.with_name(path.name + ".checkpoint")
+    query = json.dumps({"endpoint": endpoint, "params": params}, sort_keys=True, default=str)
+
+    if resume and checkpoint_path.exists() and path.exists():
+        with open(checkpoint_path, "r") as f:
+            checkpoint = json.load(f)
+        if checkpoint["query"] != query:
+            raise ValueError(
+                f"Checkpoint {checkpoint_path} is for a different query: {checkpoint['query']}"
+            )
+        if checkpoint["done"]:
+            return checkpoint["records"]
+        mode = "r+b"
+    else:
+        checkpoint = {"query": query, "last_indexes": None, "pages": 0,
+                      "records": 0, "size": 0, "done": False}
+        mode = "wb"
+
+    with open(path, mode) as f:
+        # Drop anything written after the last checkpoint
+        f.truncate(checkpoint["size"])
+        f.seek(checkpoint["size"])
+
+        pages = iter_pages(endpoint, params, throttle=throttle,
+                           last_indexes=checkpoint["last_indexes"])
+        for page in pages:
+            f.write(b"".join((json.dumps(result) + "\n").encode() for result in page["results"]))
+            f.flush()
+            os.fsync(f.fileno())
+
+            checkpoint["last_indexes"] = page["pagination"]["last_indexes"]
+            checkpoint["pages"] += 1
+            checkpoint["records"] += len(page["results"])
+            checkpoint["size"] = f.tell()
+            checkpoint["done"] = (checkpoint["last_indexes"] is None or not page["results"])
+            _save_checkpoint(checkpoint, checkpoint_path)
 
-    # Start with first page
-    current_page = get_fec(endpoint, params)
-    results = []
+    return checkpoint["records"]
 
-    # Loop as long as "last_indexes" section exists
-    while current_page["pagination"]["last_indexes"] is not None:
-        results += current_page["results"]
-        current_page = get_next_page(current_page, endpoint, params)
-    return results
+def _save_checkpoint(checkpoint: dict, path: Path):
+    """Atomically replace the checkpoint at path"""
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
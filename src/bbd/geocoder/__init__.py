@@ -4,10 +4,29 @@ from .geocoder import (
     encode_street_address,
     LocationsGeocoder,
 )
+from .cache import GeocodeCache, CachedGeocoder
+from .normalize import normalize_addresses
+from .tiger import TigerGeocoder
+from .backends import (
+    GeocoderBackend,
+    NominatimBackend,
+    PhotonBackend,
+    FakeBackend,
+)
+from .census_batch import CensusBatchBackend
 
 __all__ = [
 	get_geocoder,
 	get_reverse_geocoder,
 	encode_street_address,
-	LocationsGeocoder
+	LocationsGeocoder,
+	GeocodeCache,
+	CachedGeocoder,
+	normalize_addresses,
+	TigerGeocoder,
+	GeocoderBackend,
+	NominatimBackend,
+	PhotonBackend,
+	FakeBackend,
+	CensusBatchBackend
 ]
\ No newline at end of file
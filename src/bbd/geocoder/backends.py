@@ -0,0 +1,158 @@
+"""Geocoder backends with configurable concurrency and rate.
+
+The public Nominatim server allows one request per second (see get_geocoder),
+but a self-hosted Nominatim or Photon server can take many requests at once.
+A backend pairs a geocoding service with the number of requests to run in
+parallel (`max_workers`) and the minimum delay between starting requests
+(`min_delay`), so throughput is limited by the server, not by bbd.
+
+Backends can be used as the geocoder of LocationsGeocoder, which then runs
+`max_workers` requests at a time.
+"""
+
+import hashlib
+import time
+from threading import Lock
+from typing import Callable, Optional
+
+from geopy.geocoders import Nominatim, Photon
+from geopy.location import Location
+
+from .cache import normalize_query
+
+"""Order of address components in a full address string"""
+COMPONENT_ORDER = ["street", "city", "county", "state", "postalcode", "country"]
+
+
+class GeocoderBackend:
+    """Base class of geocoder backends. Subclasses implement geocode(query).
+
+    Calling a backend geocodes a query (a full address string or a dict of
+    address components, as built by LocationsGeocoder) while respecting
+    `min_delay` across all threads.
+
+    Arguments
+    ---------
+    max_workers : int
+        Number of requests LocationsGeocoder runs in parallel.
+
+    min_delay : float
+        Minimum number of seconds between the start of two requests.
+    """
+
+    def __init__(self, max_workers: int = 1, min_delay: float = 0.0):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.min_delay = min_delay
+
+        self._lock = Lock()
+        self._next_call = 0.0
+
+    @property
+    def cache_kind(self) -> str:
+        """Kind of the results of this backend in a GeocodeCache, so that
+        results of different services are not mixed."""
+        return type(self).__name__
+
+    def geocode(self, query) -> Optional[Location]:
+        raise NotImplementedError
+
+    def __call__(self, query, *args, **kwargs) -> Optional[Location]:
+        self._wait()
+        return self.geocode(query, *args, **kwargs)
+
+    def _wait(self):
+        """Blocks until `min_delay` seconds after the previous call started"""
+        if not self.min_delay:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_call)
+            self._next_call = start + self.min_delay
+        time.sleep(start - now)
+
+
+class NominatimBackend(GeocoderBackend):
+    """Nominatim server, e.g. a self-hosted one at `domain`.
+
+    For the public server (nominatim.openstreetmap.org) use get_geocoder,
+    which follows its usage policy.
+
+    Examples
+    --------
+    >>> backend = NominatimBackend("localhost:8080", max_workers=16)
+    >>> gl = LocationsGeocoder(data, backend, "geocoded.tsv")
+    """
+
+    def __init__(self, domain: str = "localhost:8080", scheme: str = "http",
+                 user_agent: str = "bbd", max_workers: int = 8,
+                 min_delay: float = 0.0, timeout: float = 10, **kwargs):
+        super().__init__(max_workers, min_delay)
+        self._geocoder = Nominatim(domain=domain, scheme=scheme,
+                                   user_agent=user_agent, timeout=timeout,
+                                   **kwargs)
+
+    def geocode(self, query, *args, **kwargs) -> Optional[Location]:
+        return self._geocoder.geocode(query, *args, **kwargs)
+
+
+class PhotonBackend(GeocoderBackend):
+    """Photon server (https://github.com/komoot/photon), e.g. a self-hosted
+    one at `domain`. Photon does not take address components, so they are
+    joined into a full address string."""
+
+    def __init__(self, domain: str = "localhost:2322", scheme: str = "http",
+                 max_workers: int = 8, min_delay: float = 0.0,
+                 timeout: float = 10, **kwargs):
+        super().__init__(max_workers, min_delay)
+        self._geocoder = Photon(domain=domain, scheme=scheme,
+                                timeout=timeout, **kwargs)
+
+    def geocode(self, query, *args, **kwargs) -> Optional[Location]:
+        if isinstance(query, dict):
+            query = ", ".join(str(query[key]) for key in COMPONENT_ORDER
+                              if query.get(key) is not None)
+        return self._geocoder.geocode(query, *args, **kwargs)
+
+
+class FakeBackend(GeocoderBackend):
+    """In-process backend for tests and benchmarks.
+
+    Arguments
+    ---------
+    function : (Optional) callable
+        Function of the query returning a geopy Location or None. By
+        default every query gets a made up location, derived from a hash
+        of the query (the same query always gets the same location).
+
+    delay : float
+        Seconds each request takes, to simulate network latency.
+
+    Attributes
+    ----------
+    calls : int
+        Number of queries geocoded.
+    """
+
+    def __init__(self, function: Optional[Callable] = None, delay: float = 0.0,
+                 max_workers: int = 1, min_delay: float = 0.0):
+        super().__init__(max_workers, min_delay)
+        self.function = function
+        self.delay = delay
+        self.calls = 0
+
+    def geocode(self, query, *args, **kwargs) -> Optional[Location]:
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+
+        if self.function is not None:
+            return self.function(query)
+
+        digest = hashlib.sha1(normalize_query(query).encode()).digest()
+        latitude = 25 + 24 * digest[0] / 255
+        longitude = -125 + 58 * digest[1] / 255
+        return Location(str(query), (latitude, longitude), {})
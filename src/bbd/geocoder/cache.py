@@ -0,0 +1,229 @@
+"""Persistent cache of geocoding results.
+
+Geocoding through Nominatim takes at least a second per address, so results
+are worth keeping across sessions and projects. `GeocodeCache` stores them in
+a SQLite database in the `working_directory`, keyed by the normalized query
+(case and whitespace insensitive). Queries without a match ("negative"
+results) are cached too, so they are not retried on every run.
+"""
+
+import json
+import math
+import sqlite3
+import time
+from pathlib import Path
+from threading import RLock
+from typing import Optional, Union, Tuple
+
+from geopy.location import Location
+from geopy.point import Point
+
+from ..working_directory import working_directory
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocodes (
+    kind TEXT NOT NULL,
+    query TEXT NOT NULL,
+    latitude REAL,
+    longitude REAL,
+    address TEXT,
+    raw TEXT,
+    created REAL NOT NULL,
+    PRIMARY KEY (kind, query)
+);
+"""
+
+
+def normalize_query(query) -> str:
+    """Cache key of a geocoder query.
+
+    Strings are lower cased with whitespace collapsed, dicts of address
+    components are sorted by component (empty components are dropped) and
+    points (for reverse geocoding) are rounded to 7 decimals (~1cm).
+
+    >>> normalize_query(" 123  Main St,  Denver CO ")
+    "123 main st, denver co"
+    >>> normalize_query({"street": "123 Main St", "city": "Denver", "county": None})
+    '{"city": "denver", "street": "123 main st"}'
+    """
+    if isinstance(query, dict):
+        components = {
+            str(key).lower(): _normalize_str(value)
+            for key, value in query.items()
+            if not _is_empty(value)
+        }
+        return json.dumps(components, sort_keys=True)
+
+    if isinstance(query, (tuple, list, Point)):
+        point = Point(query)
+        return f"{point.latitude:.7f},{point.longitude:.7f}"
+
+    return _normalize_str(query)
+
+
+def _normalize_str(value) -> str:
+    return " ".join(str(value).lower().split())
+
+
+def _is_empty(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    return isinstance(value, str) and not value.strip()
+
+
+class GeocodeCache:
+    """Geocoding results stored in SQLite.
+
+    path: database file, relative to the `working_directory`. Defaults to
+        "geocode_cache.sqlite", shared by everything using the default. Use
+        ":memory:" for a cache that only lasts as long as this object.
+    ttl: Optional. Seconds after which cached results expire.
+    cache_negative: whether to cache queries without a match.
+    negative_ttl: Optional. Seconds after which cached negative results
+        expire, e.g. to retry them sooner than other results. Defaults to `ttl`.
+    max_entries: Optional. Number of results to keep; the oldest results are
+        deleted first. Use with ":memory:" to bound memory use.
+
+    The cache can be used by several threads at once.
+
+    Example:
+
+        >>> cache = GeocodeCache(ttl=90 * 24 * 60 * 60)
+        >>> geocode = get_geocoder("valid.email@address.com", cache=cache)
+        >>> geocode("1315 10th St, Sacramento, CA 95814")  # Cached from now on
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str, None] = None,
+        ttl: Optional[float] = None,
+        cache_negative: bool = True,
+        negative_ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        if path is None:
+            path = "geocode_cache.sqlite"
+
+        self.path = path if path == ":memory:" else working_directory.resolve(path)
+        self.ttl = ttl
+        self.cache_negative = cache_negative
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.max_entries = max_entries
+
+        self._lock = RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM geocodes").fetchone()[0]
+
+    def lookup(self, query, kind: str = "geocode") -> Tuple[bool, Optional[Location]]:
+        """Returns (found, location) for a query. `location` is None for
+        cached negative results (and when not found)."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT latitude, longitude, address, raw, created FROM geocodes "
+                "WHERE kind = ? AND query = ?",
+                (kind, normalize_query(query)),
+            ).fetchone()
+
+        if row is None:
+            return False, None
+
+        latitude, longitude, address, raw, created = row
+        negative = latitude is None
+        ttl = self.negative_ttl if negative else self.ttl
+        if ttl is not None and time.time() - created > ttl:
+            return False, None
+        if negative:
+            return (True, None) if self.cache_negative else (False, None)
+
+        return True, Location(address, (latitude, longitude), json.loads(raw))
+
+    def store(self, query, location: Optional[Location], kind: str = "geocode") -> None:
+        """Caches the result of a query (None if there was no match)"""
+
+        if location is None:
+            if not self.cache_negative:
+                return
+            values = (None, None, None, None)
+        else:
+            values = (
+                location.latitude,
+                location.longitude,
+                location.address,
+                json.dumps(location.raw, default=str),
+            )
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocodes "
+                "(kind, query, latitude, longitude, address, raw, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, normalize_query(query), *values, time.time()),
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM geocodes WHERE rowid IN (SELECT rowid FROM geocodes "
+                    "ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self, kind: Optional[str] = None) -> None:
+        """Deletes all cached results (of one kind, if given)"""
+        with self._lock, self._conn:
+            if kind is None:
+                self._conn.execute("DELETE FROM geocodes")
+            else:
+                self._conn.execute("DELETE FROM geocodes WHERE kind = ?", (kind,))
+
+
+class CachedGeocoder:
+    """Wraps a geocode (or reverse geocode) function, e.g. a geopy
+    RateLimiter, so that each query only reaches it once. Cache hits skip the
+    wrapped function entirely, including its rate limiting."""
+
+    def __init__(self, geocoder, cache: GeocodeCache, kind: str = "geocode"):
+        self.geocoder = geocoder
+        self.cache = cache
+        self.kind = kind
+
+    @property
+    def max_workers(self) -> int:
+        """Parallel requests supported by the wrapped geocoder"""
+        return getattr(self.geocoder, "max_workers", 1)
+
+    def __call__(self, query, *args, **kwargs) -> Optional[Location]:
+        found, location = self.cache.lookup(query, self.kind)
+        if found:
+            return location
+
+        location = self.geocoder(query, *args, **kwargs)
+        self.cache.store(query, location, self.kind)
+        return location
+
+
+def resolve_cache(cache) -> Optional[GeocodeCache]:
+    """Cache for the `cache` argument of the geocoder functions: True for the
+    default (shared) cache, a GeocodeCache, or None/False for no cache"""
+    if isinstance(cache, GeocodeCache):
+        return cache
+    if cache is True:
+        return GeocodeCache()
+    if cache is None or cache is False:
+        return None
+    raise ValueError("cache must be a bool or a bbd.geocoder.GeocodeCache")
@@ -0,0 +1,159 @@
+"""Census Geocoder batch backend.
+
+The Census Geocoder (https://geocoding.geo.census.gov/geocoder/) takes batches
+of up to 10,000 addresses per request as a CSV file and returns their
+coordinates together with the census state, county, tract and block they
+fall in, so no separate point-in-shape step is needed.
+"""
+
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import requests
+from geopy.location import Location
+
+from .backends import GeocoderBackend
+
+CENSUS_BATCH_URL = (
+    "https://geocoding.geo.census.gov/geocoder/geographies/addressbatch"
+)
+
+"""Columns of the batch response (which has no header row)"""
+RESPONSE_COLUMNS = [
+    "id", "input_address", "match", "match_type", "matched_address",
+    "coordinates", "tigerlineid", "side", "state", "county", "tract", "block",
+]
+
+_MAX_BATCH_SIZE = 10000
+
+
+class CensusBatchBackend(GeocoderBackend):
+    """Geocoder backend for the Census Geocoder's batch endpoint.
+
+    LocationsGeocoder sends all unique addresses of each of its batches
+    through geocode_batch, which splits them into requests of `batch_size`
+    addresses and submits `max_workers` requests at a time. Use a
+    LocationsGeocoder batch_size of several times `batch_size` to keep all
+    workers busy.
+
+    Locations have the census block (15 digit "geoid"), "state", "county",
+    "tract" and "block" in their raw data. LocationsGeocoder saves the
+    `fields` ("geoid") as extra columns.
+
+    Arguments
+    ---------
+    url : str
+        The batch endpoint, e.g. of a local stand-in for testing.
+
+    benchmark, vintage : str
+        Address range and geography versions,
+        see https://geocoding.geo.census.gov/geocoder/benchmarks
+
+    batch_size : int
+        Addresses per request, at most 10,000.
+
+    Examples
+    --------
+    >>> backend = CensusBatchBackend(max_workers=4)
+    >>> gl = LocationsGeocoder(data, backend, "geocoded.tsv", batch_size=40000)
+    >>> gl.run()
+    """
+
+    fields = ["geoid"]
+
+    def __init__(self, url: str = CENSUS_BATCH_URL,
+                 benchmark: str = "Public_AR_Current",
+                 vintage: str = "Current_Current",
+                 batch_size: int = _MAX_BATCH_SIZE,
+                 max_workers: int = 4, min_delay: float = 0.0,
+                 timeout: float = 600):
+        super().__init__(max_workers, min_delay)
+        if not 0 < batch_size <= _MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {_MAX_BATCH_SIZE}")
+
+        self.url = url
+        self.benchmark = benchmark
+        self.vintage = vintage
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+    @property
+    def cache_kind(self) -> str:
+        return f"{type(self).__name__}:{self.benchmark}:{self.vintage}"
+
+    def geocode(self, query, *args, **kwargs) -> Optional[Location]:
+        return self._submit([query])[0]
+
+    def __call__(self, query, *args, **kwargs) -> Optional[Location]:
+        return self.geocode(query)
+
+    def geocode_batch(self, queries: list) -> List[Optional[Location]]:
+        """Geocode many queries (address strings or dicts of address
+        components). Returns a location (or None) for each query, in order."""
+        chunks = [queries[start:start + self.batch_size]
+                  for start in range(0, len(queries), self.batch_size)]
+
+        if len(chunks) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                results = list(executor.map(self._submit, chunks))
+        else:
+            results = [self._submit(chunk) for chunk in chunks]
+
+        return [location for chunk in results for location in chunk]
+
+    def _submit(self, queries: list) -> List[Optional[Location]]:
+        """One request to the batch endpoint"""
+        self._wait()
+
+        f = io.StringIO()
+        writer = csv.writer(f)
+        for n, query in enumerate(queries):
+            writer.writerow([n, *_address_fields(query)])
+
+        r = requests.post(
+            self.url,
+            data = {"benchmark": self.benchmark, "vintage": self.vintage},
+            files = {"addressFile": ("addresses.csv", f.getvalue(), "text/csv")},
+            timeout = self.timeout,
+        )
+        if not r.ok:
+            raise RuntimeError(f"Bad request. Status code: {r.status_code} "
+                               f"Url: {self.url}")
+
+        return parse_batch_response(r.text, len(queries))
+
+
+def parse_batch_response(text: str, num_queries: int) -> List[Optional[Location]]:
+    """Locations (or None) by id of a batch response. Rows are not returned
+    in the order they were submitted."""
+    locations = [None] * num_queries
+
+    for row in csv.reader(io.StringIO(text)):
+        if not row:
+            continue
+        values = dict(zip(RESPONSE_COLUMNS, row))
+        if values.get("match") != "Match" or not values.get("coordinates"):
+            continue # No_Match or Tie
+
+        longitude, latitude = (float(v) for v in values["coordinates"].split(","))
+        raw = {k: v for k, v in values.items()
+               if k not in ("id", "input_address", "coordinates")}
+        if all(values.get(k) for k in ("state", "county", "tract", "block")):
+            raw["geoid"] = (values["state"] + values["county"]
+                            + values["tract"] + values["block"])
+
+        locations[int(values["id"])] = Location(
+            values["matched_address"], (latitude, longitude), raw)
+
+    return locations
+
+
+def _address_fields(query) -> list:
+    """(street, city, state, zip) of a query. Full address strings are sent
+    as the street, which the Census Geocoder also parses."""
+    if not isinstance(query, dict):
+        return [query, "", "", ""]
+    return [query.get(key) or ""
+            for key in ("street", "city", "state", "postalcode")]
@@ -4,18 +4,26 @@ from geopy.extra.rate_limiter import RateLimiter
 
 from pathlib import Path
 from .utils import is_valid_email
+from .cache import GeocodeCache, CachedGeocoder, resolve_cache
+from .normalize import normalize_addresses
+from .tiger import TigerGeocoder
+from .backends import GeocoderBackend
+from .progress import ProgressBitmap, fingerprint
 
 from tqdm.auto import tqdm
-from functools import lru_cache
 
 from inspect import signature
+import csv
+import os
 import re
 
+import numpy as np
 import pandas as pd
 
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-def get_geocoder(email):
+def get_geocoder(email, cache = None):
     """Get geocode function for geocoding through Nominatim with supplied
     email address as the user_agent, as per Nominatim's usage policy.
 
@@ -28,6 +36,11 @@ def get_geocoder(email):
     email : str
         A string email Address supplied to Nominatim as user_agent
 
+    cache : (Optional) bool or bbd.geocoder.GeocodeCache
+        Cache results on disk so that each address is only sent to
+        Nominatim once, across sessions. True uses the default cache
+        file in the working_directory. Not cached by default.
+
     Examples
     --------
     >>> email = "valid.email@address.com"
@@ -45,10 +58,14 @@ def get_geocoder(email):
     assert is_valid_email(email), "Must enter a valid email"
     geolocator=Nominatim(user_agent=email)
     geocoder=RateLimiter(geolocator.geocode, min_delay_seconds=1)
+
+    cache = resolve_cache(cache)
+    if cache is not None:
+        return CachedGeocoder(geocoder, cache, kind = "geocode")
     return geocoder
 
 
-def get_reverse_geocoder(email):
+def get_reverse_geocoder(email, cache = None):
     """Get reverse geocode function for reverse geocoding through Nominatim 
     with supplied email address as the user_agent, as per Nominatim's 
     usage policy.
@@ -62,6 +79,11 @@ def get_reverse_geocoder(email):
     email : str
         A string email Address supplied to Nominatim as user_agent
 
+    cache : (Optional) bool or bbd.geocoder.GeocodeCache
+        Cache results on disk so that each point is only sent to
+        Nominatim once, across sessions. True uses the default cache
+        file in the working_directory. Not cached by default.
+
     Examples
     --------
 
@@ -80,6 +102,10 @@ def get_reverse_geocoder(email):
     assert is_valid_email(email), "Must enter a valid email"
     geolocator = Nominatim(user_agent=email)
     reverse_geocoder = RateLimiter(geolocator.reverse, min_delay_seconds=1)
+
+    cache = resolve_cache(cache)
+    if cache is not None:
+        return CachedGeocoder(reverse_geocoder, cache, kind = "reverse")
     return reverse_geocoder
 
 
@@ -93,8 +119,9 @@ def encode_street_address(street) -> str:
 
     Arguments
     ---------
-    street : str
-        a string street component of address
+    street : str or pd.Series
+        a string street component of address, or a Series of them to
+        encode all at once (missing values become empty strings)
 
     >>> encode_street_address("123 Test St")
     "123 Test St"
@@ -108,6 +135,11 @@ def encode_street_address(street) -> str:
         r"[Rr](?:oo)?m |[Bb](?:ui)?ld(?:in)?g |[Uu]pp?e?r|[Ll]o?we?r|"
         r"[Ss](?:ui)?te |[Ff](?:l )?(?:rnt)?|[Tt]r(?:ai)?le?r |[Dd]ept ))"
     )
+    if isinstance(street, pd.Series):
+        street = street.astype("string")
+        result = street.str.extract(f"({pattern})", expand = False)
+        return result.fillna(street).fillna("")
+
     try:
         result = re.search(pattern, street) or street
     except TypeError:
@@ -124,9 +156,10 @@ class LocationsGeocoder:
     will remember your progress across session and also allows user to 
     only run a number of batches of size batch_size.
 
-    Please note, this process MAY NOT be multi-threaded or run in parallel.
-    Please read Nominatim's Usage Policy here: 
-    https://operations.osmfoundation.org/policies/nominatim/
+    Please note, with the public Nominatim server this process MAY NOT be 
+    multi-threaded or run in parallel. Please read Nominatim's Usage 
+    Policy here: https://operations.osmfoundation.org/policies/nominatim/
+    Self-hosted servers can be run in parallel with a GeocoderBackend.
 
     Attributes
     ----------
@@ -164,7 +197,9 @@ class LocationsGeocoder:
         See Nominatim's Usage Policy.
 
     path : str or pathlib Path object
-        A path to where geocoded data will be saved.
+        A path to where geocoded data will be saved. Progress is kept 
+        in a bitmap next to it (path + ".progress") so that resuming 
+        does not need to read the saved results.
 
     batch_size : (Optional) int
         Number of batches to geocode at a time. Useful for running subset of
@@ -183,6 +218,19 @@ class LocationsGeocoder:
         }
         Will set country to United States by default.
 
+    cache : (Optional) bool or bbd.geocoder.GeocodeCache
+        Where results are cached so that repeated addresses (e.g. an
+        apartment building) are only geocoded once. By default the 4000 
+        most recent results are cached in memory for this object only. 
+        True uses the default cache file in the working_directory, 
+        shared across sessions, projects and get_geocoder.
+
+    normalize : (Optional) bool
+        Whether to normalize addresses (casing, USPS abbreviations, 
+        5-digit zip codes) before geocoding. Rows with the same 
+        normalized address are geocoded once and the result is shared 
+        between them. True by default.
+
     keep_index : (Optional) bool
         Whether to use the index of data for the geocoded result. If 
         False, will construct index like range(len(data)).
@@ -200,9 +248,12 @@ class LocationsGeocoder:
         secondary descriptors attached and therefore will not be 
         geocoded.
 
-    geocoder : geopy.extras.RateLimiter
+    geocoder : geopy.extras.RateLimiter, TigerGeocoder or GeocoderBackend
         Enter a function inheriting from geopy.geocoders.Geocoder wrapped
-        by geopy.extras.RateLimiter
+        by geopy.extras.RateLimiter, a TigerGeocoder to geocode 
+        offline from Census address ranges, or a GeocoderBackend (e.g.
+        NominatimBackend for a self-hosted server) to geocode with
+        its max_workers requests in parallel.
 
     email : str
         Email str to pass to Nominatim as user_agent
@@ -220,15 +271,25 @@ class LocationsGeocoder:
         existing file.
     """
 
-    _cache_size = 4000
+    # Results are written to disk in chunks of this many rows.
+    _flush_every = 1000
+
     def __init__(self, data, email, path, batch_size = 3600,
                  defaults = {"Country":"United States"}, 
-                 keep_index = True, index_name = ""):
+                 keep_index = True, index_name = "", cache = None,
+                 normalize = True):
         """Constructor for bbd.geocoder.GeocodeLocations"""
 
         # Creates geocoder with email passed as user_agent
         self.geocoder = email # self.email is alias for self.geocoder
 
+        # cache is for appeasing the Nominatim gods.
+        # when same address is runned multiple times e.g. an apartment bldg.
+        self.cache = resolve_cache(cache)
+        if self.cache is None:
+            # Bounded, repeats within a batch are also deduplicated.
+            self.cache = GeocodeCache(":memory:", max_entries = 4000)
+
         self.defaults = defaults.copy()
 
         self.data = pd.DataFrame(data)
@@ -269,6 +330,13 @@ class LocationsGeocoder:
 
         self.batch_size = batch_size
 
+        # Extra result fields saved by the geocoder, e.g. "geoid" for the
+        # CensusBatchBackend
+        self.fields = list(getattr(self.geocoder, "fields", []))
+
+        # Identifies the progress bitmap of this data
+        self._fingerprint = fingerprint(self.data[self.included_cols])
+
         # Check file status then load or create file.
         self.path = Path(path).resolve()
         try:
@@ -276,12 +344,10 @@ class LocationsGeocoder:
             self._init_existing_file()
         # Has never been run before.
         except FileNotFoundError:
-            self.locations = pd.DataFrame(columns = ['latitude', 
-                                                     'longitude', 
-                                                     'address'])
             self._init_new_file()
 
         # Set default street encoder
+        self.normalize = normalize
         self.street_encode = encode_street_address
 
 
@@ -289,12 +355,19 @@ class LocationsGeocoder:
         """Make new file at self.path and put in the header, then 
         fills _queue
         """
-        header = f"{self.index_name}\tlatitude\tlongitude\taddress\n"
-        with open(self.path, "w") as f:
-            f.write(header)
+        header = [self.index_name or "", "latitude", "longitude", 
+                  "address", *self.fields]
+        with open(self.path, "w", newline = "") as f:
+            self._writer(f).writerow(header)
 
-        # Filling _queue
-        self._queue = deque(self.data.index)
+        self.locations = pd.DataFrame(columns = header[1:])
+
+        self._progress = ProgressBitmap.create(self._progress_path(), 
+                                               len(self.data),
+                                               self._fingerprint)
+
+        # Filling _queue with positions of rows in self.data
+        self._queue = deque(range(len(self.data)))
 
         # Set batch info: Only used for display purposes
         self.tot_batches = len(self._queue)//self.batch_size + 1
@@ -302,26 +375,54 @@ class LocationsGeocoder:
 
 
     def _init_existing_file(self):
-        """Load existing file at self.path and verifies it is related to
-        this data. Then loads the _queue based on file. 
+        """Verifies existing file at self.path is related to this data. 
+        Then loads the _queue based on the progress bitmap next to it 
+        (rebuilt from the file if missing or made for other data). 
+        Results are only loaded from the file when self.locations is 
+        used.
         """
-        # Load already geocoded results.
-        self.locations = pd.read_csv(self.path, sep = '\t',
-                                     index_col = self.index_name or 0)
-            
-        # check that self.locations is appropriate file.
-        if not all([col in self.locations.columns for col 
+        with open(self.path, newline = "") as f:
+            header = next(csv.reader(f, delimiter = "\t"), [])
+
+        # check that file at self.path is appropriate file.
+        if not all([col in header for col 
                     in ["latitude", 'longitude', 'address']]):
             raise ValueError(f"Path {self.path} is an unrelated file! "
                               "File should be generated by this "
                               "program and contain columns for "
                               "latitude, longitude, and address.")
 
+        # Rows are appended with this geocoder's fields, e.g. "geoid".
+        columns = ["latitude", "longitude", "address", *self.fields]
+        if header[1:] != columns:
+            raise ValueError(f"File at {self.path} has columns "
+                             f"{header[1:]}, but this geocoder saves "
+                             f"{columns}. Resume with the geocoder that "
+                             "started the file or use a new path.")
+
+        self._locations = None # Loaded lazily
+        self._new_locations = []
+
+        try:
+            self._progress = ProgressBitmap.open(self._progress_path(), 
+                                                 len(self.data),
+                                                 self._fingerprint)
+        except (FileNotFoundError, ValueError):
+            # e.g. file from an older version: mark rows in the file. 
+            # Rows sharing a (duplicated) label count as saved together.
+            saved = pd.read_csv(self.path, sep = '\t', usecols = [0],
+                                index_col = 0).index
+            positions = np.flatnonzero(self.data.index.isin(saved))
+
+            self._progress = ProgressBitmap.create(self._progress_path(), 
+                                                   len(self.data),
+                                                   self._fingerprint)
+            self._progress.mark(positions)
+            self._progress.flush()
+
         # Set _queue
-        self._queue = deque([i for i in self.data.index if i 
-                             not in self.locations.index])
+        self._queue = deque(self._progress.remaining().tolist())
 
-        
         # Set batch info: Only used for display purposes
         tot_run = len(self.data.index) - len(self._queue)
 
@@ -329,118 +430,265 @@ class LocationsGeocoder:
         self.curr_batch = tot_run//self.batch_size + 1
 
 
-    # cache is for appeasing the Nominatim gods.
-    # when same address is runned multiple times e.g. an apartment bldg.
-    @lru_cache(maxsize = _cache_size)
-    def _run_geocoder(self, *args, **kwargs
-                       ) -> geopy.location.Location or None:
-        """Run the geocoder based on inputs."""
-        if args and not kwargs:
-            return self.geocoder(*args)
-
-        elif kwargs and not args:
-            return self.geocoder(kwargs) # not unpacked to pass dict.
-
-        else:
-            _msg = "Either pass full address as arg or components as keywords"
-            raise ValueError(_msg)
+    def _progress_path(self):
+        """Progress bitmap next to the file at self.path"""
+        return self.path.with_name(self.path.name + ".progress")
 
 
-    def _process_address_string(self, i):
-        """Return results when data is list of str or only has 
-        single address column.
-
-        Returns (lat, lon, address)
+    @property
+    def locations(self):
+        """Geocoded results as pd.DataFrame indexed like data."""
+        if self._locations is None:
+            # Batches run since start-up are already in the file.
+            self.locations = self._read_locations()
+
+        elif self._new_locations:
+            parts = [self._locations] if not self._locations.empty else []
+            self._locations = pd.concat(parts + self._new_locations)
+            self._new_locations = []
+
+        return self._locations
+
+
+    @locations.setter
+    def locations(self, new):
+        self._locations = new
+        self._new_locations = []
+
+
+    def _read_locations(self):
+        """Load already geocoded results from the file at self.path."""
+        locations = pd.read_csv(self.path, sep = '\t',
+                                index_col = self.index_name or 0,
+                                dtype = {f: str for f in self.fields},
+                                keep_default_na = False,
+                                na_values = [""])
+
+        # Rows saved again after an interruption: keep the latest.
+        return locations[~locations.index.duplicated(keep = "last")]
+
+
+    def _run_geocoder(self, query) -> geopy.location.Location or None:
+        """Run the geocoder on a query (full address str or dict of
+        components), unless the result is already in self.cache."""
+        found, result = self.cache.lookup(query, self._cache_kind())
+        if not found:
+            result = self.geocoder(query)
+            self.cache.store(query, result, self._cache_kind())
+        return result
+
+
+    def _run_geocoder_batch(self, queries) -> list:
+        """Run the geocoder's geocode_batch (see CensusBatchBackend) on
+        all queries not already in self.cache. Returns results in order."""
+        kind = self._cache_kind()
+        cached = [self.cache.lookup(query, kind) for query in queries]
+        missing = [query for query, (found, _) in zip(queries, cached)
+                   if not found]
+        new_results = iter(self.geocoder.geocode_batch(missing)
+                           if missing else [])
+
+        results = []
+        for query, (found, result) in zip(queries, cached):
+            if not found:
+                result = next(new_results)
+                self.cache.store(query, result, kind)
+            results.append(result)
+        return results
+
+
+    def _cache_kind(self):
+        """Kind of self.geocoder's results in self.cache: e.g. 
+        "CensusBatchBackend:<benchmark>:<vintage>" for backends, so that 
+        results of different services are not mixed, and "geocode" 
+        (shared with get_geocoder) for Nominatim."""
+        return getattr(self.geocoder, "cache_kind", "geocode")
+
+
+    def _is_address_string(self):
+        """Whether data is list of str or only has single address 
+        column (rather than address components)."""
+        return (len(self.data.columns) == 1 
+                or len(self.included_cols) == 1 
+                    and self.included_cols[0] == 'address')
+
+
+    def _prepare_queries(self):
+        """Normalize all addresses at once (if self.normalize) into 
+        self._query_data, number identical addresses with the same 
+        address id and build the query values of each row 
+        (self._query_rows) in one pass.
         """
-        try:
-            col = self.included_cols[0]
-        except NameError:
-            col = self.data.columns[0]
-        address = self.data.loc[i, col]
-        
-        result = self._run_geocoder(address)
-        if result is None:
-            return None, None, address
-        else:
-            return result.latitude, result.longitude, result.address
-
+        query_data = self.data[self.included_cols]
 
-    def _process_address_components(self, i):
-        """Return geocoded results when data is list of dict
-        or dataframe of address components.
-
-        Returns (lat, lon, address)
+        if self.normalize:
+            if self.street_encode is encode_street_address:
+                encode = encode_street_address # Vectorized
+            else:
+                encode = lambda streets: streets.astype(object).where(
+                    streets.notna(), None).map(self.street_encode)
+
+            query_data = normalize_addresses(
+                query_data, street_encode = encode,
+                full_address = self._is_address_string())
+
+        self._query_data = query_data
+        self._address_ids = query_data.groupby(
+            self.included_cols, dropna = False, sort = False
+        ).ngroup().to_numpy()
+
+        # Query keys of the columns, e.g. "Zip5" -> "postalcode"
+        self._query_keys = [self._component_key(col) 
+                            for col in self.included_cols]
+        self._query_defaults = {self._component_key(key): value 
+                                for key, value in self.defaults.items()}
+        if "street" in self._query_defaults and not self.normalize:
+            self._query_defaults["street"] = self.street_encode(
+                self._query_defaults["street"])
+
+        # Missing components as None, streets encoded if not normalized.
+        columns = []
+        for col, key in zip(self.included_cols, self._query_keys):
+            values = query_data[col].astype(object)
+            values = values.where(values.notna(), None)
+            if (key == "street" and not self.normalize 
+                    and not self._is_address_string()):
+                values = values.map(self.street_encode, na_action = "ignore")
+            columns.append(values)
+
+        self._query_rows = list(zip(*columns))
+
+
+    @staticmethod
+    def _component_key(key):
+        """Key of an address component in queries passed to Nominatim"""
+        key = str(key).lower()
+        # With components address is assumed to be street component
+        if key in ("address", "street"):
+            return "street"
+        elif key in ("zip5", "zip", "zipcode", "postal"):
+            return "postalcode"
+        return key
+
+
+    def _address_query(self, i):
+        """Query for the row at position i: the address str when data is 
+        list of str or only has single address column, else a dict of 
+        components for Nominatim.
         """
-        def component_formatter(key, value):
-            """Helper function to format keys for address passed 
-            to Nominatim.
+        row = self._query_rows[i]
+        if self._is_address_string():
+            return row[0]
 
-            Returns formatted (key, value) pair
-            """
-            # With components address is assumed to be street component
-            if key.lower() == "address" or key.lower() == "street":
-                return "street", self.street_encode(value)
+        # Non-missing components, then defaults
+        address = {key: value for key, value in zip(self._query_keys, row)
+                   if value is not None}
+        address.update(self._query_defaults)
 
-            elif (key.lower() in ("zip5", "zip", "zipcode")
-                  or key.lower() == "postal"):
-                return "postalcode", value
+        return address
 
-            else:
-                return key.lower(), value
-        
-        # Unpack components in self.data
-        address = {key: value for key, value in 
-                   [component_formatter(col, self.data.loc[i, col]) 
-                   for col in self.included_cols]}
 
-        # Set default components in defaults
-        for key, value in zip(self.defaults, self.defaults.values()):
-            key, value = component_formatter(key, value)
-            address[key] = value
+    def _format_result(self, query, result):
+        """Returns (lat, lon, address, *fields) of a geocoded query"""
+        if result is not None:
+            raw = result.raw if isinstance(result.raw, dict) else {}
+            return (result.latitude, result.longitude, result.address,
+                    *[raw.get(field) for field in self.fields])
 
-        result = self._run_geocoder(**address)
-
-        if result is None:
+        if isinstance(query, dict):
             # Format Address in proper order.
-            formatted_address = ", ".join([str(address[key]) for key in 
-                                          ['street', 'city', 
-                                          'county', 'state', 
-                                          'country', 'postalcode']
-                                          if key in address])
-            return None, None, formatted_address
-        else:
-            return result.latitude, result.longitude, result.address
+            query = ", ".join([str(query[key]) for key in 
+                               ['street', 'city', 
+                               'county', 'state', 
+                               'country', 'postalcode']
+                               if key in query])
+        return (None, None, query, *[None for _ in self.fields])
 
 
     def _run_batch(self, batch_list):
         """Run each item from batch_list through geocoder 
-        saving to disk as it goes and updating self.locations
-        once complete.
+        saving to disk as it goes (every _flush_every rows) and 
+        updating self.locations once complete.
 
-        batch - list of indexes from queue to run through 
-                self.geocoder.
+        batch - list of positions (of rows in self.data) from queue to 
+                run through self.geocoder.
         """
-        # tqdm for progress bar.
-        with open(self.path, "a") as f:
-            desc = f"{self.curr_batch}/{self.tot_batches}"
-            for i in tqdm(batch_list, desc = desc):
-                # For list of str or dataframe of 1 column
-                if (len(self.data.columns) == 1 
-                        or len(self.included_cols) == 1 
-                            and self.included_cols[0] == 'address'):
-                    lat, lon, address = self._process_address_string(i)
+        if self._query_data is None:
+            self._prepare_queries()
+
+        # Rows with the same address share one result.
+        rows = {}
+        for i in batch_list:
+            rows.setdefault(self._address_ids[i], []).append(i)
+        queries = [self._address_query(address_rows[0])
+                   for address_rows in rows.values()]
 
-                # For DataFrame or list of dicts
-                else:
-                    lat, lon, address = self._process_address_components(i)
+        # Backends (see bbd.geocoder.backends) may run requests in parallel.
+        max_workers = getattr(self.geocoder, "max_workers", 1)
 
-                # Add processed addresses to self.locations
-                self.locations.loc[i, ['latitude', 
-                                       'longitude', 
-                                       'address']] = lat, lon, address
+        labels = self.data.index
+        positions = []
+        records = []
+        buffer = []
+
+        # tqdm for progress bar.
+        with open(self.path, "a", newline = "") as f, \
+                ThreadPoolExecutor(max_workers) as executor:
+            writer = self._writer(f)
+            desc = f"{self.curr_batch}/{self.tot_batches}"
 
-                # Save processed address to path.
-                f.write(f'{i}\t{lat or ""}\t{lon or ""}\t"{address}"\n')
+            # Batch backends geocode all queries at once.
+            if hasattr(self.geocoder, "geocode_batch"):
+                results = self._run_geocoder_batch(queries)
+            elif max_workers > 1:
+                results = executor.map(self._run_geocoder, queries)
+            else:
+                results = map(self._run_geocoder, queries)
+
+            flushed = 0
+            for address_rows, query, result in tqdm(
+                    zip(rows.values(), queries, results),
+                    total = len(queries), desc = desc):
+                record = self._format_result(query, result)
+                for i in address_rows:
+                    positions.append(i)
+                    records.append(record)
+                    buffer.append((labels[i], *record))
+
+                # Save processed addresses to path.
+                if len(buffer) >= self._flush_every:
+                    self._flush(f, writer, buffer, positions[flushed:])
+                    flushed = len(positions)
+                    buffer = []
+
+            self._flush(f, writer, buffer, positions[flushed:])
+
+        # Add processed addresses to self.locations
+        columns = ['latitude', 'longitude', 'address', *self.fields]
+        index = labels[positions]
+        index.name = self.index_name or labels.name
+        self._new_locations.append(
+            pd.DataFrame(records, columns = columns, index = index))
+
+
+    @staticmethod
+    def _writer(f):
+        """Tab delimited csv writer for the file at self.path, quoting 
+        values with tabs, quotes or line breaks."""
+        return csv.writer(f, delimiter = "\t", lineterminator = "\n")
+
+
+    def _flush(self, f, writer, buffer, positions):
+        """Append rows to the file and make sure they reach the disk, 
+        then mark them completed in the progress bitmap."""
+        if not buffer:
+            return
+        writer.writerows(buffer)
+        f.flush()
+        os.fsync(f.fileno())
+
+        self._progress.mark(positions)
+        self._progress.flush()
 
 
     def run(self, num_batches=None):
@@ -452,25 +700,21 @@ class LocationsGeocoder:
             print("Beginning Geocoding: This may take many hours. "
                   "Progress saved as it goes.")
 
-        if num_batches <= 0 or len(self._queue) == 0:
-            print("All done!", flush = True)
-            return self.locations
+        while num_batches > 0 and self._queue:
+            batch = [self._queue.popleft() for _ in 
+                     range(min(self.batch_size, len(self._queue)))]
 
-        batch = [] # need to decide how to pull batches from queue
-        for i in range(self.batch_size):
-            try:
-                batch.append(self._queue.popleft())
-            except IndexError:
-                break # reached end of Queue
+            print(f"Running batch {self.curr_batch} of {self.tot_batches}: ", 
+                  flush = True)
+            self._run_batch(batch)
 
-        print(f"Running batch {self.curr_batch} of {self.tot_batches}: ", 
-              flush = True)
-        self._run_batch(batch)
+            print("Batch complete!", flush = True)
+            self.curr_batch += 1 # Update batch count
+            num_batches -= 1
 
-        print("Batch complete!", flush = True)
-        self.curr_batch += 1 # Update batch count
-        
-        return self.run(num_batches-1)
+        if not self._queue:
+            print("All done!", flush = True)
+        return self.locations
 
 
     def reset(self):
@@ -514,6 +758,7 @@ class LocationsGeocoder:
                              "taking str address to str encoded address")
 
         self._street_encode = new_encoder
+        self._query_data = None # Queries are re-encoded on next run
 
 
     @property
@@ -524,7 +769,9 @@ class LocationsGeocoder:
     @geocoder.setter
     def geocoder(self, new):
         """Setter for geocoder. Geocoder can be a geopy geocoder instance,
-        a geopy RateLimiter or a str email.
+        a geopy RateLimiter (optionally cached, see get_geocoder), an 
+        offline TigerGeocoder, a GeocoderBackend (e.g. a self-hosted 
+        Nominatim) or a str email.
         """
         if type(new) == str:
             try:
@@ -535,13 +782,16 @@ class LocationsGeocoder:
                 new_email = input("Please enter a valid email: ")
                 self.geocoder = new_email # recursion
 
-        elif type(new) == geopy.extra.rate_limiter.RateLimiter:
+        elif (type(new) in (geopy.extra.rate_limiter.RateLimiter,
+                            CachedGeocoder, TigerGeocoder)
+                or isinstance(new, GeocoderBackend)):
             self._geocoder = new
 
         else:
             errormsg = ("geocoder must be str email to change Nominatim "
-                        "user_agent, or a geopy geocoder wrapped in geopy"
-                        " RateLimiter.")
+                        "user_agent, a geopy geocoder wrapped in geopy"
+                        " RateLimiter, a TigerGeocoder or a "
+                        "GeocoderBackend.")
             raise ValueError(errormsg)
 
 
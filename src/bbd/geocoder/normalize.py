@@ -0,0 +1,192 @@
+"""Vectorized normalization of address components before geocoding.
+
+Voter files spell the same address many ways ("123 Main Street Apt 4",
+"123 MAIN ST"). Normalizing them to USPS standard abbreviations
+(https://pe.usps.com/text/pub28/28apc_002.htm) lets LocationsGeocoder send each
+address to the geocoder only once.
+"""
+
+import re
+
+import pandas as pd
+
+"""Common USPS street suffix abbreviations (Publication 28, Appendix C1)"""
+STREET_SUFFIXES = {
+    "ALLEY": "ALY",
+    "AVENUE": "AVE",
+    "AV": "AVE",
+    "BOULEVARD": "BLVD",
+    "BRIDGE": "BRG",
+    "BYPASS": "BYP",
+    "CAUSEWAY": "CSWY",
+    "CENTER": "CTR",
+    "CIRCLE": "CIR",
+    "COURT": "CT",
+    "COVE": "CV",
+    "CREEK": "CRK",
+    "CRESCENT": "CRES",
+    "CROSSING": "XING",
+    "DRIVE": "DR",
+    "EXPRESSWAY": "EXPY",
+    "EXTENSION": "EXT",
+    "FREEWAY": "FWY",
+    "GARDENS": "GDNS",
+    "GROVE": "GRV",
+    "HEIGHTS": "HTS",
+    "HIGHWAY": "HWY",
+    "HILL": "HL",
+    "HOLLOW": "HOLW",
+    "JUNCTION": "JCT",
+    "LAKE": "LK",
+    "LANDING": "LNDG",
+    "LANE": "LN",
+    "LOOP": "LOOP",
+    "MEADOWS": "MDWS",
+    "MOUNT": "MT",
+    "MOUNTAIN": "MTN",
+    "PARKWAY": "PKWY",
+    "PKY": "PKWY",
+    "PLACE": "PL",
+    "PLAZA": "PLZ",
+    "POINT": "PT",
+    "RIDGE": "RDG",
+    "ROAD": "RD",
+    "ROUTE": "RTE",
+    "SQUARE": "SQ",
+    "STREET": "ST",
+    "STR": "ST",
+    "TERRACE": "TER",
+    "TRACE": "TRCE",
+    "TRAIL": "TRL",
+    "TURNPIKE": "TPKE",
+    "VALLEY": "VLY",
+    "VIEW": "VW",
+    "VILLAGE": "VLG",
+    "WAY": "WAY",
+}
+
+"""USPS directional abbreviations"""
+DIRECTIONALS = {
+    "NORTH": "N",
+    "SOUTH": "S",
+    "EAST": "E",
+    "WEST": "W",
+    "NORTHEAST": "NE",
+    "NORTHWEST": "NW",
+    "SOUTHEAST": "SE",
+    "SOUTHWEST": "SW",
+}
+
+_DIRECTIONAL_WORDS = "|".join(list(DIRECTIONALS) + list(DIRECTIONALS.values()))
+
+# Suffixes are only abbreviated at the end of the street (before any
+# post-directional), so that e.g. "LAKE SHORE DRIVE" -> "LAKE SHORE DR".
+# A comma also ends the street, for full address strings.
+_SUFFIX_PATTERN = re.compile(
+    r"(?<=\S )(" + "|".join(sorted(STREET_SUFFIXES, key=len, reverse=True))
+    + r")(?=(?: (?:" + _DIRECTIONAL_WORDS + r"))?(?:,|$))"
+)
+_PRE_DIRECTIONAL_PATTERN = re.compile(
+    r"^(\d\S* )(" + "|".join(DIRECTIONALS) + r")(?= \S+ \S)"
+)
+_POST_DIRECTIONAL_PATTERN = re.compile(
+    r"(?<=\S )(" + "|".join(DIRECTIONALS) + r")(?=,|$)"
+)
+
+_STREET_COLUMNS = ("address", "street")
+_POSTAL_COLUMNS = ("zip5", "zip", "zipcode", "postal", "postalcode")
+
+
+def normalize_text(values: pd.Series) -> pd.Series:
+    """Upper case, without periods and with single spaces. Missing values
+    stay missing."""
+    values = pd.Series(values, dtype="string")
+    return (values.str.upper()
+                  .str.replace(".", "", regex=False)
+                  .str.replace(r"\s+", " ", regex=True)
+                  .str.strip())
+
+
+def normalize_street(streets: pd.Series, street_encode=None) -> pd.Series:
+    """Normalize street addresses: upper case, USPS suffix and directional
+    abbreviations, e.g. "123 North Main Street" -> "123 N MAIN ST".
+
+    street_encode: Optional function applied (vectorized) before
+        abbreviating, e.g. encode_street_address to remove secondary unit
+        designators. It is called with the whole Series.
+    """
+    streets = pd.Series(streets, dtype="string")
+    if street_encode is not None:
+        streets = pd.Series(street_encode(streets), dtype="string")
+
+    return abbreviate(normalize_text(streets).str.replace(",", "", regex=False))
+
+
+def abbreviate(values: pd.Series) -> pd.Series:
+    """Replace (upper case) street suffixes and directionals with their USPS
+    abbreviations, e.g. "123 NORTH MAIN STREET" -> "123 N MAIN ST" """
+    values = values.str.replace(
+        _PRE_DIRECTIONAL_PATTERN,
+        lambda m: m[1] + DIRECTIONALS[m[2]],
+        regex=True,
+    )
+    values = values.str.replace(
+        _POST_DIRECTIONAL_PATTERN, lambda m: DIRECTIONALS[m[1]], regex=True
+    )
+    return values.str.replace(
+        _SUFFIX_PATTERN, lambda m: STREET_SUFFIXES[m[1]], regex=True
+    )
+
+
+def normalize_street_name(street: str) -> str:
+    """normalize_street for a single street, e.g. from a geocoder query"""
+    street = " ".join(str(street).upper().replace(".", "").replace(",", "").split())
+    street = _PRE_DIRECTIONAL_PATTERN.sub(
+        lambda m: m[1] + DIRECTIONALS[m[2]], street)
+    street = _POST_DIRECTIONAL_PATTERN.sub(
+        lambda m: DIRECTIONALS[m[1]], street)
+    return _SUFFIX_PATTERN.sub(lambda m: STREET_SUFFIXES[m[1]], street)
+
+
+def normalize_zip5(zips: pd.Series) -> pd.Series:
+    """5-digit zip codes as strings, restoring leading zeros lost to numeric
+    parsing (e.g. 2351 -> "02351") and dropping ZIP+4 extensions
+    (e.g. "80202-1234" -> "80202")."""
+    zips = pd.Series(zips, dtype="string").str.strip()
+
+    # e.g. "2351.0" when read as a float column
+    zips = zips.str.replace(r"\.0+$", "", regex=True)
+    digits = zips.str.extract(r"^(\d{1,9})(?:-\d{4})?$", expand=False)
+
+    # ZIP+4 written without a dash
+    digits = digits.where(digits.str.len() != 9, digits.str[:5])
+    return digits.str.zfill(5).where(digits.str.len() <= 5)
+
+
+def normalize_addresses(data: pd.DataFrame, columns=None,
+                        street_encode=None,
+                        full_address=False) -> pd.DataFrame:
+    """Normalize the address component columns of `data` (VAN style names,
+    not case sensitive, e.g. "Address", "City", "State", "Zip5"), all at
+    once. Other columns are returned unchanged.
+
+    full_address: the columns are full address strings, e.g.
+    "123 Main Street, Denver CO". They get suffix abbreviations, but
+    `street_encode` is not applied since it could cut off the city.
+    """
+    data = data.copy()
+    if columns is None:
+        columns = list(data.columns)
+
+    for col in columns:
+        key = str(col).lower()
+        if full_address:
+            data[col] = abbreviate(normalize_text(data[col]))
+        elif key in _STREET_COLUMNS:
+            data[col] = normalize_street(data[col], street_encode)
+        elif key in _POSTAL_COLUMNS:
+            data[col] = normalize_zip5(data[col])
+        else:
+            data[col] = normalize_text(data[col]).str.replace(
+                ",", "", regex=False)
+    return data
@@ -0,0 +1,110 @@
+"""Progress of LocationsGeocoder runs as a bitmap file.
+
+One bit per row of the input data (by position) records whether the row has
+been geocoded and saved. The file is memory mapped, so marking rows only
+writes the changed pages, and resuming a multi-million row job only reads a
+few hundred kilobytes instead of the whole results file.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+_MAGIC = b"BBDPROG2"
+_FINGERPRINT_SIZE = 16
+_HEADER_SIZE = 32  # magic + number of rows (uint64) + fingerprint
+
+
+class ProgressBitmap:
+    """Memory mapped bitmap of completed row positions.
+
+    Use ProgressBitmap.create for a new (empty) bitmap and ProgressBitmap.open
+    for an existing one. The `fingerprint` of the input data (see
+    fingerprint()) is stored with the bitmap, so that a bitmap of other data
+    with the same number of rows is not used.
+    """
+
+    def __init__(self, path: Union[Path, str], size: int, bits: np.memmap):
+        self.path = Path(path)
+        self.size = size
+        self._bits = bits
+
+    @classmethod
+    def create(cls, path: Union[Path, str], size: int,
+               fingerprint: bytes = b"") -> "ProgressBitmap":
+        """Make a new bitmap of `size` rows, none of them completed.
+        Overwrites the file at path."""
+        with open(path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(np.uint64(size).tobytes())
+            f.write(_padded(fingerprint))
+            f.truncate(_HEADER_SIZE + _num_bytes(size))
+        return cls.open(path, size, fingerprint)
+
+    @classmethod
+    def open(cls, path: Union[Path, str], size: int,
+             fingerprint: bytes = b"") -> "ProgressBitmap":
+        """Open an existing bitmap. Raises FileNotFoundError if there is
+        none, or ValueError if it is not a bitmap of `size` rows with this
+        fingerprint."""
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+
+        if (len(header) != _HEADER_SIZE or header[:8] != _MAGIC
+                or int(np.frombuffer(header[8:16], dtype = np.uint64)[0]) != size
+                or header[16:] != _padded(fingerprint)):
+            raise ValueError(f"{path} is not a progress bitmap of this data "
+                             f"({size} rows)")
+
+        bits = np.memmap(path, dtype = np.uint8, mode = "r+",
+                         offset = _HEADER_SIZE, shape = (_num_bytes(size),))
+        return cls(path, size, bits)
+
+    def mark(self, positions) -> None:
+        """Mark row positions as completed (in memory until flush)"""
+        positions = np.asarray(positions, dtype = np.int64)
+        if positions.size == 0:
+            return
+        np.bitwise_or.at(self._bits, positions >> 3,
+                         np.left_shift(1, positions & 7).astype(np.uint8))
+
+    def flush(self) -> None:
+        """Write marked rows to disk"""
+        self._bits.flush()
+
+    def completed(self) -> np.ndarray:
+        """Boolean array, True for each completed row"""
+        return np.unpackbits(self._bits, bitorder = "little")[:self.size] \
+            .astype(bool)
+
+    def remaining(self) -> np.ndarray:
+        """Positions of rows that are not completed, in order"""
+        return np.flatnonzero(~self.completed())
+
+    def __contains__(self, position: int) -> bool:
+        return bool(self._bits[position >> 3] >> (position & 7) & 1)
+
+    def __len__(self) -> int:
+        """Number of completed rows"""
+        return int(self.completed().sum())
+
+
+def fingerprint(data: pd.DataFrame) -> bytes:
+    """Hash of the index and values of `data` (and so of its row count)"""
+    hashes = pd.util.hash_pandas_object(data, index = True).to_numpy()
+    digest = hashlib.blake2b(hashes.tobytes(), digest_size = _FINGERPRINT_SIZE)
+    digest.update(np.uint64(len(data)).tobytes())
+    return digest.digest()
+
+
+def _padded(fingerprint: bytes) -> bytes:
+    if len(fingerprint) > _FINGERPRINT_SIZE:
+        raise ValueError(f"fingerprint is longer than {_FINGERPRINT_SIZE} bytes")
+    return fingerprint.ljust(_FINGERPRINT_SIZE, b"\0")
+
+
+def _num_bytes(size: int) -> int:
+    return (size + 7) // 8
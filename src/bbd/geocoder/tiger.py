@@ -0,0 +1,177 @@
+"""Offline geocoding from Census TIGER/Line address range features.
+
+Each ADDRFEAT feature is a street segment with the range of house numbers on
+its left and right side (e.g. 101-199 and 100-198) and their zip codes. An
+address is geocoded by finding the segment of its street whose range contains
+the house number and interpolating the number's position along the segment.
+
+This is less precise than Nominatim (positions are on the street centerline
+and assume evenly spaced numbers), but needs no network once the county
+files are downloaded, and geocodes thousands of addresses per second.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+import shapefile
+import shapely
+from geopy.location import Location
+from shapely.geometry import shape as to_geometry
+
+from ..census.get_shapefile import get_shapefile, ADDRESS_FEATURES
+from ..gis.utils import resolve_shapefile_path
+from .normalize import normalize_street_name
+
+# e.g. "123 N MAIN ST" or "123A N MAIN ST"
+_HOUSE_NUMBER = re.compile(r"^(\d+)[A-Z]?(?:-\d+[A-Z]?)? (.+)$")
+_ZIP5 = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+_SIDES = (("L", "LFROMHN", "LTOHN", "ZIPL"), ("R", "RFROMHN", "RTOHN", "ZIPR"))
+
+
+class TigerGeocoder:
+    """Geocoder interpolating addresses from TIGER/Line ADDRFEAT shapefiles.
+
+    Can be used like the geocoders of get_geocoder, e.g. as the geocoder of
+    LocationsGeocoder. Queries are either full address strings
+    ("123 Main St, Denver, CO 80202") or dicts of address components with at
+    least a "street" (as built by LocationsGeocoder). The zip code
+    ("postalcode"), when given, disambiguates streets with the same name.
+
+    Arguments
+    ---------
+    paths : str, Path or list of them
+        ADDRFEAT shapefiles, or the directories they were extracted to
+        (e.g. as returned by get_shapefile).
+
+    Examples
+    --------
+    >>> geocode = TigerGeocoder.from_counties("CO", ["031", "005"])
+    >>> geocode("1437 Bannock St, Denver, CO 80202")
+    Location(1437 BANNOCK ST, 80202, (39.7393, -104.9902, 0.0))
+    """
+
+    # Kind of results in a GeocodeCache
+    cache_kind = "TigerGeocoder"
+
+    def __init__(self, paths: Union[Path, str, List[Union[Path, str]]]):
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+
+        # Address ranges, one per side of each street segment
+        self._streets = {} # street name -> list of range indexes
+        self._ranges = [] # (from, to, zip, feature index, side)
+        self._tlids = []
+        geometries = []
+
+        for path in paths:
+            self._read(resolve_shapefile_path(path), geometries)
+
+        self._geometries = np.array(geometries, dtype=object)
+
+    @classmethod
+    def from_counties(cls, state: Union[int, str], counties: List[Union[int, str]],
+                      year: int = 2019, cache: bool = True) -> "TigerGeocoder":
+        """Download (see bbd.census.get_shapefile) the ADDRFEAT files of
+        counties within a state and build a geocoder from them."""
+        if isinstance(counties, (int, str)):
+            counties = [counties]
+        paths = [get_shapefile(ADDRESS_FEATURES, state, year, cache = cache,
+                               county = county)
+                 for county in counties]
+        return cls(paths)
+
+    def _read(self, path: Path, geometries: list):
+        with shapefile.Reader(str(path)) as shpf:
+            logging.info(f"Reading address features: {path}")
+
+            for shape_record in shpf.iterShapeRecords():
+                record = shape_record.record.as_dict()
+                if not record.get("FULLNAME") or not shape_record.shape.points:
+                    continue
+
+                feature = len(geometries)
+                geometries.append(
+                    to_geometry(shape_record.shape.__geo_interface__))
+                self._tlids.append(record.get("TLID"))
+
+                name = normalize_street_name(record["FULLNAME"])
+                for side, from_field, to_field, zip_field in _SIDES:
+                    start = _house_number(record.get(from_field))
+                    end = _house_number(record.get(to_field))
+                    if start is None or end is None:
+                        continue
+
+                    self._streets.setdefault(name, []).append(len(self._ranges))
+                    self._ranges.append((start, end, record.get(zip_field) or None,
+                                         feature, side))
+
+    def __len__(self) -> int:
+        """Number of address ranges"""
+        return len(self._ranges)
+
+    def __call__(self, query, *args, **kwargs) -> Optional[Location]:
+        """Geocode a query, returns None if there is no matching range."""
+        street, postalcode = _parse_query(query)
+        if street is None:
+            return None
+
+        match = _HOUSE_NUMBER.match(normalize_street_name(street))
+        if match is None:
+            return None
+        number, name = int(match[1]), match[2]
+
+        best = None
+        for r in self._streets.get(name, ()):
+            start, end, zip5, feature, side = self._ranges[r]
+            if not (min(start, end) <= number <= max(start, end)):
+                continue
+            # Sides have either odd or even numbers
+            if start % 2 == end % 2 and (number - start) % 2:
+                continue
+
+            if postalcode is None or zip5 == postalcode:
+                best = r
+                break
+            if best is None:
+                best = r # Right street, other zip code
+
+        if best is None:
+            return None
+
+        start, end, zip5, feature, side = self._ranges[best]
+        fraction = 0.5 if start == end else (number - start) / (end - start)
+        point = shapely.line_interpolate_point(
+            self._geometries[feature], fraction, normalized = True)
+
+        address = f"{number} {name}" + (f", {zip5}" if zip5 else "")
+        raw = {"tlid": self._tlids[feature], "side": side, "zip": zip5,
+               "from": start, "to": end}
+        return Location(address, (point.y, point.x), raw)
+
+
+def _house_number(value) -> Optional[int]:
+    """House number of a range end, None if missing or not numeric
+    (e.g. "N123")"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return int(value) if value.isdigit() else None
+
+
+def _parse_query(query):
+    """Returns (street, 5 digit zip code or None) of a geocoder query"""
+    if isinstance(query, dict):
+        street = query.get("street")
+        postalcode = query.get("postalcode")
+        if postalcode is not None:
+            match = _ZIP5.search(str(postalcode).zfill(5))
+            postalcode = match[1] if match else None
+        return street, postalcode
+
+    parts = str(query).split(",")
+    match = _ZIP5.search(",".join(parts[1:]))
+    return parts[0], match[1] if match else None
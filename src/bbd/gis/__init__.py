@@ -1,13 +1,17 @@
 from .make_map import make_map
 from .trim_shapefile import trim_shapefile
+from .interpolate import Crosswalk
 from .utils import (
     are_coordinates_in_shape,
+    assign_shapes,
     get_geojson_bounds,
 )
 
 __all__ = [
     make_map,
     trim_shapefile,
+    Crosswalk,
     are_coordinates_in_shape,
+    assign_shapes,
     get_geojson_bounds,
 ]
@@ -0,0 +1,218 @@
+"""
+Areal weighted interpolation of data between two sets of shapes, e.g. from
+census block groups onto voting precincts.
+"""
+
+from hashlib import sha1
+from pathlib import Path
+from typing import Union, Optional, List
+import logging
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from ..working_directory import working_directory
+
+from .magic import Magic
+from .utils import resolve_shapefile_path, read_shapes
+
+
+class Crosswalk:
+    """Overlap between each pair of intersecting source and target shapes.
+
+    The overlaps are stored as a sparse matrix in coordinate form: the
+    overlap area between source shape `source_index[n]` and target shape
+    `target_index[n]` is `overlap[n]`.
+
+    Areas are computed in the coordinate system of the shapefiles. Only their
+    ratios are used, so the (unprojected) census shapefiles work well enough
+    for small areas.
+    """
+
+    def __init__(
+        self,
+        source_ids,
+        target_ids,
+        source_index,
+        target_index,
+        overlap,
+        source_area,
+    ):
+        self.source_ids = np.asarray(source_ids, dtype=str)
+        self.target_ids = np.asarray(target_ids, dtype=str)
+        self.source_index = np.asarray(source_index, dtype=np.int64)
+        self.target_index = np.asarray(target_index, dtype=np.int64)
+        self.overlap = np.asarray(overlap, dtype=float)
+        self.source_area = np.asarray(source_area, dtype=float)
+
+    @classmethod
+    def from_shapefiles(
+        cls,
+        source_path: Union[Path, str],
+        source_key: str,
+        target_path: Union[Path, str],
+        target_key: str,
+        cache: bool = True,
+    ) -> "Crosswalk":
+        """Compute the overlap between the shapes in two shapefiles.
+
+        Shapes are identified by their `source_key` and `target_key` record
+        values. If `cache` is True, the crosswalk is saved to (and re-used
+        from) the `working_directory`.
+        """
+
+        source_path = resolve_shapefile_path(source_path)
+        target_path = resolve_shapefile_path(target_path)
+
+        save_file = working_directory.resolve(
+            _crosswalk_filename(source_path, source_key, target_path, target_key)
+        )
+
+        if cache and save_file.exists() and save_file.is_file():
+            logging.debug(f"Using cached crosswalk: {save_file}")
+            return cls.load(save_file)
+
+        source_ids, sources = read_shapes(source_path, source_key)
+        target_ids, targets = read_shapes(target_path, target_key)
+
+        # Find intersecting pairs with a spatial index, then compute the area
+        # of all intersections at once.
+        tree = shapely.STRtree(targets)
+        source_index, target_index = tree.query(sources, predicate="intersects")
+        overlap = shapely.area(
+            shapely.intersection(sources[source_index], targets[target_index])
+        )
+
+        # Touching shapes intersect without overlapping
+        keep = overlap > 0
+
+        crosswalk = cls(
+            source_ids,
+            target_ids,
+            source_index[keep],
+            target_index[keep],
+            overlap[keep],
+            shapely.area(sources),
+        )
+
+        if cache:
+            crosswalk.save(save_file)
+
+        return crosswalk
+
+    def save(self, fp: Union[Path, str]) -> None:
+        with open(fp, "wb") as f:
+            np.savez_compressed(
+                f,
+                source_ids=self.source_ids,
+                target_ids=self.target_ids,
+                source_index=self.source_index,
+                target_index=self.target_index,
+                overlap=self.overlap,
+                source_area=self.source_area,
+            )
+
+    @classmethod
+    def load(cls, fp: Union[Path, str]) -> "Crosswalk":
+        with np.load(fp, allow_pickle=False) as archive:
+            return cls(**{k: archive[k] for k in archive.files})
+
+    def interpolate(
+        self,
+        data: dict,
+        join_on: str,
+        columns: List[str],
+        extensive: bool = True,
+        population: Optional[str] = None,
+    ) -> dict:
+        """Interpolate source `data` columns onto the target shapes.
+
+        :param data: dict in the form of {join_on: [values], "column": [values]},
+            e.g. as returned by `get_acs`. `join_on` values are matched with the
+            source shapes' `source_key`.
+        :param columns: the columns of `data` to interpolate
+        :param extensive: If True (default) columns are counts (e.g. population),
+            which are split between targets by the share of each source's area
+            that falls within them. If False, columns are rates or medians,
+            which are averaged over the sources overlapping each target,
+            weighted by overlap area.
+        :param population: Optional column of source populations. When given,
+            averages of non-extensive columns are weighted by the estimated
+            population in each overlap instead of its area.
+
+        Returns columns with one row per target shape:
+            {"target": [target ids], "column": [values], ...}
+
+        Targets overlapping a source with missing data (no row in `data`, or
+        one of `Magic.MISSING_VALUES`) get a value of None.
+        """
+
+        # Source data row for each source shape
+        rows = pd.Index(np.asarray(data[join_on], dtype=str)).get_indexer(
+            self.source_ids
+        )
+
+        weights = self.overlap / self.source_area[self.source_index]
+        if not extensive:
+            if population is None:
+                weights = self.overlap
+            else:
+                weights = weights * _source_values(data[population], rows)[
+                    self.source_index
+                ]
+            norm = self._sum_into_targets(weights)
+
+        d = {"target": self.target_ids.tolist()}
+        for column in columns:
+            values = _source_values(data[column], rows)[self.source_index]
+            result = self._sum_into_targets(weights * values)
+
+            if not extensive:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    result = result / norm
+
+            d[column] = [None if np.isnan(v) else v for v in result.tolist()]
+
+        return d
+
+    def _sum_into_targets(self, values: np.ndarray) -> np.ndarray:
+        """Sum values of each source-target pair into their target (a sparse
+        matrix multiplication)
+        """
+
+        result = np.bincount(
+            self.target_index, weights=values, minlength=len(self.target_ids)
+        )
+
+        # Targets without any overlapping sources have no data
+        has_sources = np.bincount(self.target_index, minlength=len(self.target_ids))
+        result[has_sources == 0] = np.nan
+
+        return result
+
+
+def _source_values(values: list, rows: np.ndarray) -> np.ndarray:
+    """Numeric values for each source shape, NaN if missing"""
+
+    missing = [v for v in Magic.MISSING_VALUES if v is not None]
+
+    s = pd.to_numeric(pd.Series(values, dtype=object)).astype(float)
+    s = s.mask(s.isin(missing)).to_numpy()
+
+    # Append NaN so that sources without a row (index -1) are missing
+    return np.append(s, np.nan)[rows]
+
+
+def _crosswalk_filename(
+    source_path: Path, source_key: str, target_path: Path, target_key: str
+) -> str:
+    """Cache file name, unique to the shapefiles (and their versions) and keys"""
+
+    parts = [source_key, target_key]
+    for p in (source_path, target_path):
+        shp = p.with_suffix(".shp")
+        parts += [str(shp.resolve()), str(shp.stat().st_mtime_ns)]
+
+    digest = sha1("|".join(parts).encode()).hexdigest()[:12]
+    return f"crosswalk_{source_path.stem}_{target_path.stem}_{digest}.npz"
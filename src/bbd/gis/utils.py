@@ -5,9 +5,12 @@ GIS utility functions.
 from pathlib import Path
 import logging
 
+import numpy as np
 import shapefile
+import shapely
 from shapely.geometry import Point
 from shapely.geometry import Polygon
+from shapely.geometry import shape as to_geometry
 
 
 def are_coordinates_in_shape(
@@ -88,6 +91,84 @@ def are_coordinates_in_shape(
     return polygonIds
 
 
+def assign_shapes(
+    latitudes: list, longitudes: list, shapefile_path: str, record_key: str
+) -> list:
+    """
+    Indexed alternative to `are_coordinates_in_shape` for many points.
+
+    Takes the latitudes and longitudes as lists of equal length and returns a
+    list containing the record identifiers (`record_key` values) of the
+    polygon in the shapefile at `shapefile_path` that contains each point, or
+    None if no polygon contains the point (or its coordinates are missing).
+    Identifiers are returned as strings.
+
+    Shapefile coordinates are (x=longitude, y=latitude). Shapes are looked up
+    with a spatial index, so this is fast for millions of points.
+    """
+
+    if not len(latitudes) == len(longitudes):
+        raise ValueError("Latitudes and longitudes must be the same length!")
+
+    ids, polygons = read_shapes(resolve_shapefile_path(shapefile_path), record_key)
+
+    points = shapely.points(
+        np.asarray(longitudes, dtype=float), np.asarray(latitudes, dtype=float)
+    )
+
+    # Pairs of (point index, polygon index)
+    point_index, polygon_index = shapely.STRtree(polygons).query(
+        points, predicate="intersects"
+    )
+
+    # As in are_coordinates_in_shape, the first polygon containing a point wins
+    order = np.lexsort((polygon_index, point_index))
+    point_index, first = np.unique(point_index[order], return_index=True)
+    polygon_index = polygon_index[order][first]
+
+    polygonIds = [None for _ in latitudes]
+    for p, n in zip(point_index.tolist(), polygon_index.tolist()):
+        polygonIds[p] = ids[n]
+
+    return polygonIds
+
+
+def read_shapes(shapefile_path: Path, record_key: str):
+    """Read the `record_key` values and shapely geometries of the shapes in a
+    polygon shapefile. Returns (list of values, numpy array of geometries).
+    """
+
+    with shapefile.Reader(str(shapefile_path)) as shpf:
+        logging.info(f"Reading shapefile: {shapefile_path}")
+
+        if shpf.shapeType not in (
+            shapefile.POLYGON,
+            shapefile.POLYGONM,
+            shapefile.POLYGONZ,
+        ):
+            raise ValueError(
+                "Cannot read shapes of shapefiles that do not have a polygon shape type."
+            )
+
+        ids = []
+        geometries = []
+        for shape_record in shpf.iterShapeRecords():
+            try:
+                ids.append(str(shape_record.record[record_key]))
+            except (KeyError, IndexError):
+                raise KeyError(
+                    f"Requested key {record_key} was not found in the file: "
+                    f"{shapefile_path}. The fields are: {shpf.fields[1:]}"
+                )
+
+            geometry = to_geometry(shape_record.shape.__geo_interface__)
+            if not geometry.is_valid:
+                geometry = geometry.buffer(0)
+            geometries.append(geometry)
+
+    return ids, np.array(geometries, dtype=object)
+
+
 def get_geojson_bounds(geojson: dict):
     """Returns geojson bounds in format compatible with
     folium.Map.set_bounds() method.
@@ -0,0 +1,282 @@
+"""Local SQLite store for data pulled from the census and OpenFEC apis.
+
+Tables are named after their source, e.g. "acs_acs5_county" (dataset and
+geography) or "fec_schedules_schedule_a" (endpoint), and are keyed by year
+and geography (census) or by "sub_id" (FEC, where available). Writing the
+same rows again updates them in place.
+"""
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from threading import RLock
+from typing import Union, List, Optional
+
+from ..working_directory import working_directory
+
+"""Census geography columns. These are kept as text to preserve leading zeros."""
+GEOGRAPHY_COLUMNS = {
+    "GEO_ID",
+    "us",
+    "region",
+    "division",
+    "state",
+    "county",
+    "county subdivision",
+    "place",
+    "tract",
+    "block group",
+    "block",
+    "congressional district",
+    "state legislative district (upper chamber)",
+    "state legislative district (lower chamber)",
+    "zip code tabulation area",
+}
+
+
+class Warehouse:
+    """Local analytical store (a SQLite database) for pulled data.
+
+    Example:
+
+        >>> warehouse = Warehouse()
+        >>> census.get_acs(..., warehouse=warehouse)
+        >>> warehouse.query(
+        ...     'SELECT year, county, B01003_001E FROM acs_acs5_county '
+        ...     "WHERE state = '08' ORDER BY year"
+        ... )
+    """
+
+    def __init__(self, path: Union[Path, str, None] = None):
+        if path is None:
+            path = "bbd.sqlite"
+
+        self.path = working_directory.resolve(path)
+
+        # Writes may come from several threads (e.g. `get_acs_series`)
+        self._lock = RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write_acs(
+        self,
+        data: dict,
+        dataset: str,
+        year: Union[str, int],
+        geography: str,
+    ) -> str:
+        """Write columns returned by `get_acs` to the table for `dataset` and
+        `geography`, keyed by year and the geography columns.
+        Returns the table name.
+        """
+
+        table = table_name("acs", dataset, geography)
+        num_rows = len(next(iter(data.values()), []))
+
+        data = {"year": [int(year)] * num_rows, **data}
+        key = ["year"] + [h for h in data if h in GEOGRAPHY_COLUMNS]
+
+        types = {h: "TEXT" for h in key if h != "year"}
+        types["year"] = "INTEGER"
+
+        self.write(table, data, key, types)
+        return table
+
+    def write_fec(self, results: List[dict], endpoint: str) -> str:
+        """Write OpenFEC `results` records to the table for `endpoint`, keyed by
+        "sub_id". Records without one are always inserted (their "sub_id" is
+        null). Nested values are stored as json.
+        Returns the table name.
+        """
+
+        table = table_name("fec", endpoint)
+
+        headers = []
+        for record in results:
+            headers += [h for h in record if h not in headers]
+
+        # Every table has the same key, whichever records created it
+        if "sub_id" not in headers:
+            headers.append("sub_id")
+
+        data = {h: [_flatten(record.get(h)) for record in results] for h in headers}
+
+        self.write(table, data, ["sub_id"], {"sub_id": "TEXT"}, parse_strings=False)
+        return table
+
+    def write(
+        self,
+        table: str,
+        data: dict,
+        key: Optional[List[str]] = None,
+        types: Optional[dict] = None,
+        parse_strings: bool = True,
+    ) -> None:
+        """Write columns to `table`, creating the table and any new columns.
+
+        Rows with the same `key` values as existing rows replace the written
+        columns of those rows. The key of an existing table is the one it was
+        created with. Column types are inferred unless given in `types`.
+        If `parse_strings` is True, numeric strings (as returned by the census
+        api) are stored as numbers.
+        """
+
+        key = key or []
+        types = types or {}
+        headers = list(data)
+
+        columns = {}
+        for h in headers:
+            column_type = types.get(h) or _infer_type(data[h], parse_strings)
+            columns[h] = (column_type, _converted(data[h], column_type))
+
+        with self._lock, self._conn:
+            key = self._create_or_alter(
+                table, {h: t for h, (t, _) in columns.items()}, key
+            )
+
+            names = ", ".join(_quote(h) for h in headers)
+            placeholders = ", ".join("?" for _ in headers)
+            sql = f"INSERT INTO {_quote(table)} ({names}) VALUES ({placeholders})"
+
+            # Without all key columns rows can only be inserted
+            if not all(h in headers for h in key):
+                key = []
+
+            updates = [h for h in headers if h not in key]
+            if key and updates:
+                sql += (
+                    f" ON CONFLICT ({', '.join(_quote(h) for h in key)}) DO UPDATE SET "
+                    + ", ".join(f"{_quote(h)} = excluded.{_quote(h)}" for h in updates)
+                )
+            elif key:
+                sql += " ON CONFLICT DO NOTHING"
+
+            self._conn.executemany(
+                sql, zip(*[values for _, values in columns.values()])
+            )
+
+    def _create_or_alter(self, table: str, types: dict, key: List[str]) -> List[str]:
+        """Create `table` or add its missing columns. Returns the primary key
+        of the table."""
+        existing = self.columns(table)
+
+        if not existing:
+            definitions = [f"{_quote(h)} {t}" for h, t in types.items()]
+            if key:
+                definitions.append(f"PRIMARY KEY ({', '.join(_quote(h) for h in key)})")
+            self._conn.execute(
+                f"CREATE TABLE {_quote(table)} ({', '.join(definitions)})"
+            )
+            return key
+
+        for h, t in types.items():
+            if h not in existing:
+                self._conn.execute(
+                    f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(h)} {t}"
+                )
+
+        return self.primary_key(table)
+
+    def query(self, sql: str, params: Union[list, tuple, dict] = ()) -> dict:
+        """Run a SQL query, returning the result as columns:
+        {"column": [values], ...}
+        """
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            headers = [c[0] for c in cursor.description or []]
+            rows = cursor.fetchall()
+
+        return {h: [row[n] for row in rows] for n, h in enumerate(headers)}
+
+    def tables(self) -> List[str]:
+        """Names of all tables in the warehouse"""
+        return self.query(
+            "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+        )["name"]
+
+    def columns(self, table: str) -> List[str]:
+        """Names of the columns of `table` (empty if it does not exist)"""
+        return self.query(f"PRAGMA table_info({_quote(table)})").get("name", [])
+
+    def primary_key(self, table: str) -> List[str]:
+        """Names of the primary key columns of `table` (empty if it has none)"""
+        info = self.query(f"PRAGMA table_info({_quote(table)})")
+        key = [(pk, h) for h, pk in zip(info.get("name", []), info.get("pk", [])) if pk]
+        return [h for _, h in sorted(key)]
+
+
+def table_name(*parts: str) -> str:
+    """Table name from its parts, e.g. ("acs", "acs/acs5", "block group") ->
+    "acs_acs5_block_group"
+    """
+
+    name = "_".join(str(p) for p in parts).lower()
+    name = re.sub("[^a-z0-9]+", "_", name).strip("_")
+
+    # Drop a repeated source prefix, e.g. "acs_acs_acs5_..." -> "acs_acs5_..."
+    return re.sub(r"^(acs_)acs_", r"\1", name)
+
+
+_LEADING_ZERO = re.compile(r"^-?0\d")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _infer_type(values: list, parse_strings: bool = True) -> str:
+    """Narrowest SQLite type that can hold every (non null) value"""
+
+    column_type = "INTEGER"
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, bool) or isinstance(v, int):
+            continue
+        if isinstance(v, float):
+            column_type = "REAL"
+            continue
+
+        # Strings with leading zeros are codes (e.g. fips), not numbers
+        if parse_strings and isinstance(v, str) and not _LEADING_ZERO.match(v):
+            try:
+                int(v)
+                continue
+            except ValueError:
+                pass
+            try:
+                float(v)
+                column_type = "REAL"
+                continue
+            except ValueError:
+                pass
+
+        return "TEXT"
+
+    return column_type
+
+
+def _converted(values: list, column_type: str) -> list:
+    if column_type == "INTEGER":
+        return [None if v is None else int(v) for v in values]
+    if column_type == "REAL":
+        return [None if v is None else float(v) for v in values]
+    return [None if v is None else str(v) for v in values]
+
+
+def _flatten(value):
+    """Store nested OpenFEC values as json"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
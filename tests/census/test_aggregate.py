@@ -0,0 +1,62 @@
+from math import isclose, sqrt
+
+from bbd import census
+
+DATA = {
+    "GEO_ID": ["bg1", "bg2", "bg3", "bg4", "bg5"],
+    "B01003_001E": ["100", "200", "300", "-666666666", "50"],
+    "B01003_001M": ["30", "40", "-555555555", "10", "5"],
+    "B19013_001E": ["5", "6", "7", "8", "9"],
+}
+
+MAPPING = {"bg1": "p1", "bg2": "p1", "bg3": "p2", "bg4": "p3"}
+
+
+def test_aggregate():
+    result = census.aggregate(DATA, "GEO_ID", MAPPING, ["B01003_001E"], "precinct")
+
+    assert result["precinct"] == ["p1", "p2", "p3"]
+    assert result["B01003_001E"] == [300, 300, None]
+
+    # Root sum of squares; controlled margin of error counts as 0
+    p1, p2, p3 = result["B01003_001M"]
+    assert isclose(p1, sqrt(30 ** 2 + 40 ** 2))
+    assert p2 == 0
+    assert p3 == 10  # Only the estimate is missing
+
+
+def test_default_variables():
+    result = census.aggregate(DATA, "GEO_ID", MAPPING)
+
+    assert list(result) == ["group", "B01003_001E", "B19013_001E", "B01003_001M"]
+    assert result["B19013_001E"] == [11, 7, 8]
+
+
+def test_default_variables_skip_name():
+    data = dict(DATA, NAME=["A", "B", "C", "D", "E"])
+    result = census.aggregate(data, "GEO_ID", MAPPING)
+
+    assert "NAME" not in result
+    assert result["B01003_001E"] == [300, 300, None]
+
+
+def test_default_variables_subject_table():
+    data = {
+        "GEO_ID": DATA["GEO_ID"],
+        "NAME": ["A", "B", "C", "D", "E"],
+        "S0101_C01_001E": ["1", "2", "3", "4", "5"],
+        "S0101_C01_001M": ["3", "4", "1", "1", "1"],
+    }
+    result = census.aggregate(data, "GEO_ID", MAPPING)
+
+    assert list(result) == ["group", "S0101_C01_001E", "S0101_C01_001M"]
+    assert result["S0101_C01_001E"] == [3, 3, 4]
+    assert result["S0101_C01_001M"][0] == 5
+
+
+def test_missing_moe():
+    data = dict(DATA, B01003_001M=["30", None, "1", "1", "1"])
+    result = census.aggregate(data, "GEO_ID", MAPPING)
+
+    assert result["B01003_001E"][0] == 300
+    assert result["B01003_001M"][0] is None
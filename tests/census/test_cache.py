@@ -0,0 +1,30 @@
+from bbd.census.cache import save_columns, load_columns
+from bbd.census.load import load_json_str
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "acs.npz"
+    columns = load_json_str(
+        '[["NAME","B03003_001E","state"],'
+        '["Colorado","5531141","08"],'
+        '["Texas",null,"48"]]'
+    )
+
+    save_columns(path, columns)
+
+    assert path.exists()
+    assert load_columns(path) == columns
+
+
+def test_headers(tmp_path):
+    path = tmp_path / "acs.npz"
+    save_columns(path, {"NAME": ["Colorado", "Texas"], "state": ["08", "48"]})
+
+    assert load_columns(path, ["state"]) == {"state": ["08", "48"]}
+
+
+def test_empty_columns(tmp_path):
+    path = tmp_path / "acs.npz"
+    save_columns(path, {"NAME": [], "state": []})
+
+    assert load_columns(path) == {"NAME": [], "state": []}
@@ -0,0 +1,68 @@
+import re
+import time
+
+from bbd import census
+
+
+def test_block_call():
+    census.api_key.key = "MyApiKey"
+
+    call = census.construct_api_call(
+        geography=census.Geography.BLOCK,
+        variables="P1_001N",
+        year=2020,
+        dataset=census.DataSets.DEC_PL,
+        state="CO",
+        county="014",
+    )
+
+    assert call == (
+        "https://api.census.gov/data/2020/dec/pl?get=P1_001N&for=block:*"
+        "&in=state:08&in=county:014&in=tract:*&key=MyApiKey"
+    )
+
+
+def _respond(call):
+    if "for=county" in call:
+        return [["NAME", "state", "county"], ["B", "08", "014"], ["A", "08", "001"]]
+
+    county = re.search(r"county:(\d+)", call).group(1)
+    return [["P1_001N", "state", "county", "tract", "block"]] + [
+        [str(n), "08", county, "000100", f"100{n}"] for n in range(2)
+    ]
+
+
+def test_get_blocks(census_api):
+    census_api.respond = _respond
+
+    blocks = census.get_blocks("P1_001N", "CO")
+
+    assert blocks["county"] == ["001", "001", "014", "014"]
+    assert blocks["block"] == ["1000", "1001"] * 2
+    assert blocks["P1_001N"] == ["0", "1"] * 2
+
+
+def test_get_blocks_window(census_api):
+    """Counties are not requested far ahead of a slow county"""
+    counties = [f"{n:03}" for n in range(1, 20)]
+    requested_while_slow = []
+
+    def respond(call):
+        if "for=county" in call:
+            return [["NAME", "state", "county"]] + [["A", "08", c] for c in counties]
+
+        county = re.search(r"county:(\d+)", call).group(1)
+        if county == "001":
+            time.sleep(0.2)
+            requested_while_slow.append(len(census_api.calls) - 1)
+        return [
+            ["P1_001N", "state", "county", "tract", "block"],
+            ["1", "08", county, "000100", "1000"],
+        ]
+
+    census_api.respond = respond
+
+    blocks = census.get_blocks("P1_001N", "CO", max_workers=2)
+
+    assert blocks["county"] == counties
+    assert requested_while_slow[0] <= 2 * 2
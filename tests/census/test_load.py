@@ -0,0 +1,44 @@
+import pytest
+
+from bbd import census
+from bbd.census.load import iter_json_rows
+
+RESPONSE = (
+    '[["NAME","B03003_001E","state"],\n'
+    '["Colorado","5531141","08"],\n'
+    '["São Paulo, \\"TX\\"",null,"48"]]'
+).encode("utf-8")
+
+
+def _chunks(b: bytes, size: int):
+    return [b[i : i + size] for i in range(0, len(b), size)]
+
+
+def test_stream_matches_str():
+    expected = census.load_json_str(RESPONSE)
+
+    # Every chunk size splits tokens (and the multi-byte "ã") differently
+    for size in range(1, len(RESPONSE) + 1):
+        assert census.load_json_stream(_chunks(RESPONSE, size)) == expected
+
+
+def test_stream_headers():
+    data = census.load_json_stream(_chunks(RESPONSE, 7), ["state"])
+
+    assert data == {"state": ["08", "48"]}
+
+
+def test_rows_are_lazy():
+    rows = iter_json_rows(iter(_chunks(RESPONSE, 40)))
+
+    assert next(rows) == ["NAME", "B03003_001E", "state"]
+
+
+def test_incomplete_response():
+    with pytest.raises(ValueError):
+        census.load_json_stream(_chunks(RESPONSE[:-10], 8))
+
+
+def test_html_response():
+    with pytest.raises(ValueError):
+        census.load_json_stream([b"<html><body>Error</body></html>"])
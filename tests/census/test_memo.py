@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bbd import census
+from bbd.census.memo import Memo
+
+
+def test_single_flight():
+    memo = Memo()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: memo.get("key", compute), range(8)))
+
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+
+
+def test_eviction():
+    memo = Memo(maxsize=2)
+
+    memo.get("a", lambda: 1)
+    memo.get("b", lambda: 2)
+    memo.get("a", lambda: 1)  # "a" is now most recently used
+    memo.get("c", lambda: 3)  # evicts "b"
+
+    assert len(memo) == 2
+    assert memo.get("a", lambda: None) == 1
+    assert memo.get("b", lambda: None) is None
+
+
+def test_errors_are_not_memoized():
+    memo = Memo()
+
+    def fail():
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError):
+        memo.get("key", fail)
+
+    assert memo.get("key", lambda: "ok") == "ok"
+
+
+def test_get_acs_memoized(census_api):
+    def respond(call):
+        time.sleep(0.1)
+        return [["NAME", "state"], ["Colorado", "08"]]
+
+    census_api.respond = respond
+
+    def get_acs(_):
+        return census.get_acs(census.Geography.STATE, "NAME", year=1999)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(get_acs, range(4)))
+
+    assert len(census_api.calls) == 1
+    assert all(r == {"NAME": ["Colorado"], "state": ["08"]} for r in results)
+
+    # Results are copies; modifying one does not affect later calls
+    results[0]["NAME"].append("Texas")
+    assert get_acs(None) == results[1]
+
+
+def test_maxcost():
+    memo = Memo(maxsize=10, maxcost=5, cost=lambda result: len(result or []))
+
+    memo.get("a", lambda: [1, 2])
+    memo.get("b", lambda: [1, 2, 3])
+    assert memo.total_cost() == 5
+
+    memo.get("c", lambda: [1])  # evicts "a"
+    assert memo.get("a", lambda: None) is None
+    assert memo.total_cost() == 4
+
+    # Too large to be kept at all
+    assert memo.get("d", lambda: list(range(6))) == list(range(6))
+    assert memo.get("d", lambda: None) is None
+    assert memo.total_cost() == 4
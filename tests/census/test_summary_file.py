@@ -0,0 +1,80 @@
+import pytest
+
+from bbd import census
+
+SUMMARY_FILE = """GEO_ID|B01003_E001|B01003_M001
+0400000US08|5684926|-555555555
+0500000US08001|505274|-555555555
+1500000US080010078011|1441|244
+1500000US080010078012||
+1500000US480010001001|871|120
+5001800US0801|721000|-555555555
+5001800US4801|766000|-555555555
+860Z200US80001|1200|150
+"""
+
+
+@pytest.fixture
+def summary_file(tmp_path):
+    fp = tmp_path / "acsdt5y2021-b01003.dat"
+    fp.write_text(SUMMARY_FILE)
+    return fp
+
+
+def test_all_rows(summary_file):
+    data = census.load_summary_file(summary_file)
+
+    assert list(data) == ["GEO_ID", "B01003_001E", "B01003_001M"]
+    assert len(data["GEO_ID"]) == 8
+    assert data["B01003_001E"][3] is None
+
+
+def test_geography(summary_file):
+    data = census.load_summary_file(
+        summary_file, ["B01003_E001"], census.Geography.BLOCKGROUP, state="CO"
+    )
+
+    assert data == {
+        "GEO_ID": ["1500000US080010078011", "1500000US080010078012"],
+        "state": ["08", "08"],
+        "county": ["001", "001"],
+        "tract": ["007801", "007801"],
+        "block group": ["1", "2"],
+        "B01003_001E": ["1441", None],
+    }
+
+
+def test_county(summary_file):
+    data = census.load_summary_file(
+        summary_file, ["B01003_001M"], census.Geography.COUNTY
+    )
+
+    assert data["county"] == ["001"]
+    assert data["B01003_001M"] == ["-555555555"]
+
+
+def test_congressional_district(summary_file):
+    data = census.load_summary_file(
+        summary_file, ["B01003_001E"], census.Geography.CD, state="CO"
+    )
+
+    assert data == {
+        "GEO_ID": ["5001800US0801"],
+        "state": ["08"],
+        "congressional district": ["01"],
+        "B01003_001E": ["721000"],
+    }
+
+
+def test_zcta(summary_file):
+    data = census.load_summary_file(
+        summary_file, ["B01003_001E"], census.Geography.ZCTA
+    )
+
+    assert data["zip code tabulation area"] == ["80001"]
+    assert data["B01003_001E"] == ["1200"]
+
+
+def test_missing_variable(summary_file):
+    with pytest.raises(ValueError):
+        census.load_summary_file(summary_file, ["B19013_001E"])
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from bbd import census
+
+# Texas is missing from 2011
+RESPONSES = {
+    year: [["B01003_001E", "state"], [str(year), "08"]]
+    + ([[str(-year), "48"]] if year > 2011 else [])
+    for year in range(2011, 2023)
+}
+
+
+@pytest.fixture
+def requested(census_api):
+    requested = []
+
+    def respond(call):
+        year = int(re.search(r"data/(\d+)/", call).group(1))
+        requested.append(year)
+        return RESPONSES[year]
+
+    census_api.respond = respond
+    return requested
+
+
+def _series(years):
+    return census.get_acs_series(census.Geography.STATE, "B01003_001E", years)
+
+
+def test_aligned(requested):
+    series = _series([2012, 2011])
+
+    assert series == {
+        "year": [2011, 2011, 2012, 2012],
+        "state": ["08", "48", "08", "48"],
+        "B01003_001E": ["2011", None, "2012", "-2012"],
+    }
+
+
+def test_incremental_refresh(requested):
+    _series(range(2011, 2022))
+    assert sorted(requested) == list(range(2011, 2022))
+
+    census.acs_memo.clear()
+    requested.clear()
+
+    series = _series(range(2011, 2023))
+    assert requested == [2022]
+    assert series["year"][-2:] == [2022, 2022]
@@ -0,0 +1,77 @@
+from bbd import census
+
+VARIABLES = {
+    "variables": {
+        "B19013_001E": {
+            "label": "Estimate!!Median household income in the past 12 months",
+            "concept": "MEDIAN HOUSEHOLD INCOME IN THE PAST 12 MONTHS",
+            "predicateType": "int",
+            "group": "B19013",
+        },
+        "B01003_001E": {
+            "label": "Estimate!!Total",
+            "concept": "TOTAL POPULATION",
+            "predicateType": "int",
+            "group": "B01003",
+        },
+        "NAME": {"label": "Geographic Area Name", "predicateType": "string"},
+    }
+}
+
+GROUPS = {
+    "groups": [
+        {"name": "B19013", "description": "MEDIAN HOUSEHOLD INCOME"},
+        {"name": "B01003", "description": "TOTAL POPULATION"},
+    ]
+}
+
+
+def _index(tmp_path):
+    index = census.VariableIndex(tmp_path / "variables.sqlite")
+    for year in (2017, 2018):
+        index.add_metadata(year, census.DataSets.ACS5_DETAIL, VARIABLES, GROUPS)
+    return index
+
+
+def test_search(tmp_path):
+    with _index(tmp_path) as index:
+        found = index.search("household income")
+
+        assert found["name"] == ["B19013_001E", "B19013_001E"]
+        assert sorted(found["year"]) == [2017, 2018]
+
+        assert index.search("income", year=2018)["year"] == [2018]
+        assert index.search("income", dataset=census.DataSets.ACS5_SUBJECT) == {
+            k: [] for k in found
+        }
+        assert index.search("household commute")["name"] == []
+
+
+def test_search_syntax_is_escaped(tmp_path):
+    with _index(tmp_path) as index:
+        assert index.search('income" OR "total')["name"] == []
+        assert index.search("   ")["name"] == []
+
+
+def test_lookup_and_group(tmp_path):
+    with _index(tmp_path) as index:
+        assert index.lookup("B01003_001E")["concept"] == ["TOTAL POPULATION"] * 2
+        assert index.group("B19013", year=2017)["name"] == ["B19013_001E"]
+        assert index.groups(year=2018)["name"] == ["B01003", "B19013"]
+
+
+def test_reindex_replaces(tmp_path):
+    with _index(tmp_path) as index:
+        index.add_metadata(2018, census.DataSets.ACS5_DETAIL, VARIABLES, GROUPS)
+
+        assert index.is_indexed(2018, census.DataSets.ACS5_DETAIL)
+        assert len(index.search("income")["name"]) == 2
+
+
+def test_persistent(tmp_path):
+    _index(tmp_path).close()
+
+    index = census.VariableIndex(
+        tmp_path / "variables.sqlite", year=2017, dataset=census.DataSets.ACS5_DETAIL
+    )
+    assert index.search("population")["year"] == [2017]
@@ -0,0 +1,73 @@
+"""Fakes of the census and OpenFEC apis shared by the tests"""
+
+import json
+
+import pytest
+import requests
+
+from bbd import census
+from bbd.fec import utilities
+from bbd.working_directory import working_directory
+
+
+class FakeResponse:
+    """Successful `requests` response with a json body"""
+
+    ok = True
+    status_code = 200
+    headers = {"Content-Type": "application/json;charset=utf-8"}
+
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+        self.text = self.content.decode()
+
+    def iter_content(self, chunk_size):
+        # Small chunks, to split json values across chunks when streaming
+        for i in range(0, len(self.content), 5):
+            yield self.content[i : i + 5]
+
+
+class FakeApi:
+    """Callable standing in for an api function. Tests set `respond` to a
+    function of the same arguments returning the response body. The
+    arguments of every call are recorded in `calls`."""
+
+    def __init__(self, wrap=lambda body: body):
+        self.respond = None
+        self.calls = []
+        self._wrap = wrap
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(args)
+        return self._wrap(self.respond(*args))
+
+
+@pytest.fixture
+def fake_requests(monkeypatch, tmp_path):
+    """Answers `requests.get(url)` with `fake_requests.respond(url)`, a json
+    body. The working directory is `tmp_path`."""
+    api = FakeApi(FakeResponse)
+    monkeypatch.setattr(requests, "get", api)
+    monkeypatch.setattr(working_directory, "_path", tmp_path)
+    return api
+
+
+@pytest.fixture
+def census_api(fake_requests, monkeypatch):
+    """`fake_requests` for census api calls, `census_api.respond(call)`
+    returns the rows. `acs_memo` starts empty."""
+    monkeypatch.setattr(census.api_key, "_key", "MyApiKey")
+    census.acs_memo.clear()
+
+    yield fake_requests
+
+    census.acs_memo.clear()
+
+
+@pytest.fixture
+def fec_api(monkeypatch):
+    """Answers the `get_fec` calls of bbd.fec.utilities with
+    `fec_api.respond(endpoint, params)`, the json content of a page."""
+    api = FakeApi()
+    monkeypatch.setattr(utilities, "get_fec", api)
+    return api
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from bbd import fec
+
+RECORDS = [
+    {"committee_id": "C1", "contributor_state": "CO", "contributor_zip": "802021234",
+     "contribution_receipt_date": "2020-01-15", "contribution_receipt_amount": 10.0},
+    {"committee_id": "C1", "contributor_state": "CO", "contributor_zip": "80202",
+     "contribution_receipt_date": "2020-01-20", "contribution_receipt_amount": 30.0},
+    {"committee_id": "C1", "contributor_state": "TX", "contributor_zip": "78701",
+     "contribution_receipt_date": "2020-02-01", "contribution_receipt_amount": 5.0},
+    {"committee_id": "C2", "contributor_state": None, "contributor_zip": None,
+     "contribution_receipt_date": "2020-02-03", "contribution_receipt_amount": 100.0},
+    {"committee_id": "C1", "contributor_state": "CO", "contributor_zip": "80301",
+     "contribution_receipt_date": "2020-01-31", "contribution_receipt_amount": 20.0},
+]
+
+
+def test_incremental_matches_single_update():
+    single = fec.FecAggregator(["committee_id", "contributor_state"]).update(RECORDS)
+
+    incremental = fec.FecAggregator(["committee_id", "contributor_state"])
+    for record in RECORDS:
+        incremental.update([record])
+
+    assert incremental.result() == single.result() == {
+        "committee_id": ["C1", "C1", "C2"],
+        "contributor_state": ["CO", "TX", None],
+        "count": [3, 1, 1],
+        "sum": [60.0, 5.0, 100.0],
+        "median": [20.0, 5.0, 100.0],
+    }
+
+
+def test_date_bucket_and_zip5():
+    result = fec.aggregate_results(
+        [RECORDS[:2], pd.DataFrame(RECORDS[2:])],
+        "contributor_zip5",
+        date_bucket="month",
+        median=False,
+    )
+
+    assert result["contributor_zip5"] == ["78701", "80202", "80301", None]
+    assert result["period"] == ["2020-02", "2020-01", "2020-01", "2020-02"]
+    assert result["count"] == [1, 2, 1, 1]
+    assert "median" not in result
+
+
+def test_many_partials():
+    aggregator = fec.FecAggregator("committee_id", median=False)
+    for _ in range(100):
+        aggregator.update(RECORDS)
+
+    assert aggregator.result()["count"] == [400, 100]
+
+
+def test_median_keeps_only_amounts():
+    aggregator = fec.FecAggregator("contributor_state", date_bucket="month")
+    for _ in range(3):
+        aggregator.update(RECORDS + [dict(RECORDS[0], contribution_receipt_amount=None)])
+
+    # One amount (and group code) per record with an amount
+    assert sum(len(a) for a in aggregator._amounts) == 3 * len(RECORDS)
+    assert all(a.dtype == float for a in aggregator._amounts)
+
+    result = aggregator.result()
+    assert result["contributor_state"] == ["CO", "TX", None]
+    assert result["median"] == [20.0, 5.0, 100.0]
+
+
+def test_empty():
+    assert fec.aggregate_results([[]], "committee_id") == {
+        "committee_id": [], "count": [], "sum": [], "median": []
+    }
+
+
+def test_unknown_bucket():
+    with pytest.raises(ValueError):
+        fec.FecAggregator("committee_id", date_bucket="decade")
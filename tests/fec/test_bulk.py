@@ -0,0 +1,64 @@
+import zipfile
+
+import pytest
+
+from bbd import fec
+
+ROWS = [
+    "C00401224|A|M3|P2020|202003199186718580|15E|IND|DOE, JANE|DENVER|CO|802021234|ACME|ENGINEER|02282020|250|C00694323|SA11AI_1|1393950|||4031920201700001",
+    "C00401224|N|M3|P2020|202003199186718581|15E|IND|SMITH, JOHN \"JACK\"|AUSTIN|TX|78701|NONE|RETIRED|02292020|25.5||SA11AI_2|1393950|X|MEMO|4031920201700002",
+    "C00000935|N|Q1|G2020|202004159223546744|15|IND|GARCÍA, ANA|BOULDER|CO|80301|SELF|WRITER|03012020|1000||A1|1405612|||4041520201700003",
+]
+
+
+@pytest.fixture
+def bulk_zip(tmp_path):
+    path = tmp_path / "indiv20.zip"
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("itcont.txt", "\n".join(ROWS).encode("latin-1"))
+        z.writestr("README.txt", "small")
+    return path
+
+
+def test_api_record_shape(bulk_zip):
+    records = fec.load_bulk_file(bulk_zip)
+
+    assert len(records) == 3
+    assert records[0]["committee_id"] == "C00401224"
+    assert records[0]["contribution_receipt_amount"] == 250.0
+    assert records[0]["contribution_receipt_date"] == "2020-02-28"
+    assert records[0]["contributor_zip"] == "802021234"
+    assert records[0]["memo_code"] is None
+    assert records[1]["contributor_name"] == 'SMITH, JOHN "JACK"'
+    assert records[2]["contributor_name"] == "GARCÍA, ANA"
+    assert records[2]["sub_id"] == "4041520201700003"
+
+
+def test_columns_and_filters(bulk_zip):
+    chunks = list(
+        fec.iter_bulk_file(
+            bulk_zip,
+            columns=["sub_id", "contribution_receipt_amount"],
+            filters={
+                "contributor_state": "CO",
+                "contribution_receipt_amount": lambda amount: amount > 500,
+            },
+            chunk_size=2,
+        )
+    )
+
+    assert chunks == [[], [{"sub_id": "4041520201700003", "contribution_receipt_amount": 1000.0}]]
+
+
+def test_text_file_as_frame(tmp_path):
+    path = tmp_path / "itcont.txt"
+    path.write_text("\n".join(ROWS), encoding="latin-1")
+
+    frames = list(fec.iter_bulk_file(path, filters={"contributor_state": ["TX"]}, as_frame=True))
+
+    assert frames[0]["contributor_city"].tolist() == ["AUSTIN"]
+
+
+def test_unknown_column(bulk_zip):
+    with pytest.raises(ValueError):
+        fec.load_bulk_file(bulk_zip, columns=["amount"])
@@ -0,0 +1,57 @@
+import pandas as pd
+import shapefile
+from geopy.extra.rate_limiter import RateLimiter
+from geopy.location import Location
+
+from bbd import fec
+
+# City -> (latitude, longitude)
+CITIES = {"DENVER": (1.0, 1.0), "AUSTIN": (1.0, 11.0), "NOWHERE": (50.0, 50.0)}
+
+RECORDS = [
+    {"sub_id": "1", "contributor_street_1": "1 Main St", "contributor_city": "Denver",
+     "contributor_state": "CO", "contributor_zip": "802021234"},
+    {"sub_id": "2", "contributor_street_1": "1 MAIN ST ", "contributor_city": "DENVER",
+     "contributor_state": "CO", "contributor_zip": "80202"},
+    {"sub_id": "3", "contributor_street_1": "2 Oak Ave", "contributor_city": "Austin",
+     "contributor_state": "TX", "contributor_zip": "78701"},
+    {"sub_id": "4", "contributor_street_1": "3 Elm St", "contributor_city": "Nowhere",
+     "contributor_state": "TX", "contributor_zip": "78701"},
+    {"sub_id": "5", "contributor_street_1": None, "contributor_city": None,
+     "contributor_state": None, "contributor_zip": None},
+]
+
+
+def test_assign_districts(tmp_path):
+    shapefile_path = tmp_path / "districts"
+    with shapefile.Writer(str(shapefile_path)) as w:
+        w.shapeType = shapefile.POLYGON
+        w.field("GEOID", "C")
+        w.poly([[[0, 0], [0, 10], [10, 10], [10, 0]]])
+        w.record("0801")
+        w.poly([[[10, 0], [10, 10], [20, 10], [20, 0]]])
+        w.record("4801")
+
+    queries = []
+
+    def geocode(query):
+        queries.append(query)
+        lat, lon = CITIES[query["city"]]
+        return Location(query["street"], (lat, lon), {})
+
+    out_path = fec.assign_districts(
+        RECORDS,
+        RateLimiter(geocode, min_delay_seconds=0),
+        shapefile_path,
+        "GEOID",
+        tmp_path / "enriched.csv",
+        chunk_size=2,
+    )
+
+    assert len(queries) == 3  # Duplicate and empty addresses are not geocoded
+
+    result = pd.read_csv(out_path, dtype={"district": str, "sub_id": str})
+    assert result["sub_id"].tolist() == ["1", "2", "3", "4", "5"]
+    assert result["district"].tolist()[:3] == ["0801", "0801", "4801"]
+    assert result["district"].isna().tolist()[3:] == [True, True]
+    assert result["latitude"].tolist()[:3] == [1.0, 1.0, 1.0]
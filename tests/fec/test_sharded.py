@@ -0,0 +1,80 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from bbd import fec
+
+
+def test_date_shards():
+    shards = fec.date_shards("2020-01-01", "2020-01-10", 3)
+
+    assert shards == [
+        ("2020-01-01", "2020-01-03"),
+        ("2020-01-04", "2020-01-06"),
+        ("2020-01-07", "2020-01-10"),
+    ]
+    assert fec.date_shards(date(2020, 1, 1), "2020-01-02", 8) == [
+        ("2020-01-01", "2020-01-01"),
+        ("2020-01-02", "2020-01-02"),
+    ]
+
+    with pytest.raises(ValueError):
+        fec.date_shards("2020-01-02", "2020-01-01", 2)
+
+
+def _respond(endpoint, params):
+    """One record per day in the date range, one per page, plus a record that
+    every query returns."""
+    start = date.fromisoformat(params.get("last_date", params["min_date"]))
+    end = date.fromisoformat(params["max_date"])
+    if start > end:
+        return {"results": [], "pagination": {"last_indexes": None}}
+
+    results = [{"sub_id": start.isoformat(), "period": params.get("two_year_transaction_period")}]
+    if start == end:
+        results.append({"sub_id": "duplicate"})
+
+    next_date = (start + timedelta(days=1)).isoformat()
+    return {"results": results, "pagination": {"last_indexes": {"last_date": next_date}}}
+
+
+def test_get_sharded_results(fec_api):
+    fec_api.respond = _respond
+
+    results = fec.get_sharded_results(
+        "schedules/schedule_a",
+        {"committee_id": "C1"},
+        min_date="2020-01-01",
+        max_date="2020-01-31",
+        num_shards=4,
+        throttle=fec.Throttle(calls_per_hour=10 ** 9),
+    )
+
+    expected = [(date(2020, 1, 1) + timedelta(days=n)).isoformat() for n in range(31)]
+    assert [r["sub_id"] for r in results if r["sub_id"] != "duplicate"] == expected
+    assert sum(r["sub_id"] == "duplicate" for r in results) == 1
+
+
+def test_two_year_periods(fec_api):
+    fec_api.respond = _respond
+
+    results = fec.get_sharded_results(
+        "schedules/schedule_a",
+        {"min_date": "2020-01-01", "max_date": "2020-01-01"},
+        two_year_transaction_periods=[2020, 2022],
+        throttle=fec.Throttle(calls_per_hour=10 ** 9),
+    )
+
+    # Same sub_id in both periods is deduplicated
+    assert [r["period"] for r in results if r["sub_id"] != "duplicate"] == [2020]
+
+
+def test_throttle():
+    throttle = fec.Throttle(calls_per_hour=3600 / 0.02)
+
+    t0 = time.perf_counter()
+    for _ in range(5):
+        throttle.wait()
+
+    assert time.perf_counter() - t0 >= 0.02 * 4 * 0.9
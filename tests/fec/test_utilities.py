@@ -0,0 +1,131 @@
+import json
+import time
+
+import pytest
+
+from bbd import fec
+
+NUM_PAGES = 5
+PER_PAGE = 3
+
+
+def _respond(endpoint, params):
+    """Pages of {"sub_id": ...} records using keyset pagination"""
+    start = params.get("last_index", 0)
+    results = [
+        {"sub_id": str(n)} for n in range(start, min(start + PER_PAGE, NUM_PAGES * PER_PAGE))
+    ]
+    last_page = start + PER_PAGE >= NUM_PAGES * PER_PAGE
+    return {
+        "results": results,
+        "pagination": {
+            "last_indexes": None if last_page else {"last_index": start + PER_PAGE}
+        },
+    }
+
+
+@pytest.fixture
+def fake_fec(fec_api):
+    fec_api.respond = _respond
+
+
+def test_iter_pages(fake_fec):
+    pages = list(fec.iter_pages("schedules/schedule_a", {"per_page": PER_PAGE}))
+
+    assert len(pages) == NUM_PAGES
+    assert pages[-1]["results"][-1] == {"sub_id": str(NUM_PAGES * PER_PAGE - 1)}
+
+
+def test_iter_pages_prefetches(fec_api):
+    def slow_respond(endpoint, params):
+        time.sleep(0.05)
+        return _respond(endpoint, params)
+
+    fec_api.respond = slow_respond
+
+    # Processing each page takes as long as fetching it. With the next page
+    # fetched in the background, that time is overlapped.
+    t0 = time.perf_counter()
+    for page in fec.iter_pages("schedules/schedule_a", {}):
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.05 * NUM_PAGES * 2 * 0.8
+
+
+def test_iter_pages_error(fec_api):
+    def failing_respond(endpoint, params):
+        if "last_index" in params:
+            raise ValueError("Bad request.")
+        return _respond(endpoint, params)
+
+    fec_api.respond = failing_respond
+
+    pages = fec.iter_pages("schedules/schedule_a", {})
+    next(pages)
+    with pytest.raises(ValueError):
+        next(pages)
+
+
+def test_write_all_results(fake_fec, tmp_path):
+    path = tmp_path / "results.jsonl"
+
+    count = fec.write_all_results("schedules/schedule_a", {}, path)
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+
+    assert count == NUM_PAGES * PER_PAGE
+    assert [r["sub_id"] for r in records] == [str(n) for n in range(count)]
+
+
+def test_write_all_results_resume(fec_api, tmp_path):
+    path = tmp_path / "results.jsonl"
+
+    def crashing_respond(endpoint, params):
+        if params.get("last_index") == 3 * PER_PAGE:
+            raise ValueError("Bad request. Status code: 429")
+        return _respond(endpoint, params)
+
+    fec_api.respond = crashing_respond
+    with pytest.raises(ValueError):
+        fec.write_all_results("schedules/schedule_a", {}, path)
+
+    # Simulate a partially written page after the last checkpoint
+    with open(path, "a") as f:
+        f.write('{"sub_id": "partial')
+
+    fec_api.respond = _respond
+    fec_api.calls.clear()
+    count = fec.write_all_results("schedules/schedule_a", {}, path, resume=True)
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+
+    assert fec_api.calls[0][1]["last_index"] == 3 * PER_PAGE  # Resumed after the last completed page
+    assert count == NUM_PAGES * PER_PAGE
+    assert [r["sub_id"] for r in records] == [str(n) for n in range(count)]
+
+    # Resuming a finished extraction does nothing
+    fec_api.calls.clear()
+    assert fec.write_all_results("schedules/schedule_a", {}, path, resume=True) == count
+    assert fec_api.calls == []
+
+    with pytest.raises(ValueError):
+        fec.write_all_results("schedules/schedule_b", {}, path, resume=True)
+
+
+def test_get_all_results_includes_last_page(fake_fec):
+    results = fec.get_all_results("schedules/schedule_a", {})
+
+    assert [r["sub_id"] for r in results] == [str(n) for n in range(NUM_PAGES * PER_PAGE)]
+
+
+def test_iter_results(fake_fec):
+    results = fec.iter_results("schedules/schedule_a", {})
+
+    assert next(results) == {"sub_id": "0"}
+    assert len(list(results)) == NUM_PAGES * PER_PAGE - 1
+
+    batches = list(fec.iter_results("schedules/schedule_a", {}, batched=True))
+    assert [len(b) for b in batches] == [PER_PAGE] * NUM_PAGES
@@ -0,0 +1,101 @@
+"""
+TESTS FOR bbd.geocoder.backends
+"""
+
+import json
+import threading
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+import pytest
+
+from bbd import geocoder as gc
+from bbd.geocoder import FakeBackend, NominatimBackend, PhotonBackend
+
+
+@pytest.fixture
+def nominatim_server():
+    """Local stand-in for a self-hosted Nominatim server"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            body = []
+            if "nowhere" not in params.get("street", [""])[0].lower():
+                body = [{"lat": "39.7", "lon": "-105.0", "place_id": 1,
+                         "display_name": params["street"][0]}]
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class TestBackends:
+
+    def test_fake_backend_parallel(self, tmp_path):
+        backend = FakeBackend(delay = 0.05, max_workers = 10)
+        data = pd.DataFrame({"Address": [f"{n} Main St" for n in range(40)],
+                             "City": ["Denver"] * 40})
+
+        gl = gc.LocationsGeocoder(data, backend, tmp_path/"test.tsv")
+        t0 = timeit.default_timer()
+        gl.run()
+        t_diff = timeit.default_timer() - t0
+
+        assert backend.calls == 40
+        assert t_diff < 40 * 0.05 / 2, "Requests were not run in parallel"
+        assert gl.locations["latitude"].notna().all()
+        assert list(gl.locations.index) == list(range(40))
+
+        # Same query, same location
+        assert backend("1 Main St").point == backend("1  main st").point
+
+
+    def test_min_delay(self):
+        backend = FakeBackend(max_workers = 4, min_delay = 0.05)
+
+        t0 = timeit.default_timer()
+        threads = [threading.Thread(target = backend, args = ("x",))
+                   for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        t_diff = timeit.default_timer() - t0
+
+        assert t_diff >= 5 * 0.05
+
+
+    def test_nominatim_backend(self, tmp_path, nominatim_server):
+        backend = NominatimBackend(nominatim_server, max_workers = 4)
+        data = pd.DataFrame({"Address": ["1 Main St", "2 Nowhere Rd"],
+                             "City": ["Denver", "Denver"]})
+
+        gl = gc.LocationsGeocoder(data, backend, tmp_path/"test.tsv")
+        locations = gl.run()
+
+        assert locations.loc[0, "latitude"] == 39.7
+        assert locations.loc[0, "address"] == "1 MAIN ST"
+        assert pd.isna(locations.loc[1, "latitude"])
+
+
+    def test_photon_query(self):
+        queries = []
+        backend = PhotonBackend()
+        backend._geocoder.geocode = lambda query: queries.append(query)
+
+        backend({"street": "1 MAIN ST", "city": "DENVER",
+                 "country": "United States"})
+        assert queries == ["1 MAIN ST, DENVER, United States"]
@@ -0,0 +1,167 @@
+"""
+TESTS FOR bbd.geocoder.CensusBatchBackend
+"""
+
+import csv
+import io
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from bbd.geocoder import CensusBatchBackend, LocationsGeocoder
+
+
+@pytest.fixture
+def census_server():
+    """Local stand-in for the Census Geocoder batch endpoint. Streets
+    containing "Nowhere" are not matched. Rows are returned in reverse
+    order, as the real endpoint does not keep the submitted order."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            message = BytesParser(policy = HTTP).parsebytes(
+                b"Content-Type: " + self.headers["Content-Type"].encode()
+                + b"\r\n\r\n" + body)
+            form = {part.get_param("name", header = "content-disposition"):
+                    part.get_content() for part in message.iter_parts()}
+            requests.append(form)
+
+            addresses = form["addressFile"]
+            if isinstance(addresses, bytes):
+                addresses = addresses.decode()
+
+            out = io.StringIO()
+            writer = csv.writer(out, quoting = csv.QUOTE_ALL)
+            for n, (id_, street, city, state, zip5) in enumerate(reversed(
+                    list(csv.reader(io.StringIO(addresses))))):
+                address = ", ".join([street, city, state, zip5])
+                if "NOWHERE" in street.upper():
+                    writer.writerow([id_, address, "No_Match"])
+                else:
+                    writer.writerow([id_, address, "Match", "Exact",
+                                     address.upper(), f"-105.0,39.{id_}",
+                                     "123", "L", "08", "031", "001800",
+                                     "1001"])
+            data = out.getvalue().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/addressbatch", requests
+    server.shutdown()
+
+
+class TestCensusBatchBackend:
+
+    def test_geocode_batch(self, census_server):
+        url, requests = census_server
+        backend = CensusBatchBackend(url, batch_size = 2, max_workers = 2)
+
+        locations = backend.geocode_batch([
+            {"street": "1 Main St", "city": "Denver", "state": "CO",
+             "postalcode": "80202"},
+            {"street": "2 Nowhere Rd", "city": "Denver"},
+            "3 Main St, Denver, CO",
+        ])
+
+        assert len(requests) == 2
+        assert requests[0]["benchmark"] == "Public_AR_Current"
+        assert locations[0].latitude == 39.0
+        assert locations[0].raw["geoid"] == "080310018001001"
+        assert locations[1] is None
+        assert locations[2].address == "3 MAIN ST, DENVER, CO, , , "
+
+
+    def test_LocationsGeocoder(self, census_server, tmp_path):
+        url, requests = census_server
+        backend = CensusBatchBackend(url, batch_size = 2, max_workers = 2)
+        data = pd.DataFrame({"Address": ["1 Main St", "1 Main Street",
+                                         "2 Nowhere Rd", "3 Oak Ave"],
+                             "City": ["Denver"] * 4,
+                             "State": ["CO"] * 4})
+        p = tmp_path/"test.tsv"
+
+        gl = LocationsGeocoder(data, backend, p, batch_size = 3)
+        locations = gl.run()
+
+        # 2 unique addresses in the first batch, 1 in the second
+        assert len(requests) == 2
+        assert locations["geoid"].fillna("").tolist() == [
+            "080310018001001", "080310018001001", "", "080310018001001"]
+
+        saved = pd.read_csv(p, sep = "\t", index_col = 0,
+                            dtype = {"geoid": str})
+        assert saved["geoid"].tolist()[:2] == ["080310018001001"] * 2
+        assert pd.isna(saved.loc[2, "latitude"])
+
+        # Resuming reads the geoid back as str
+        gl = LocationsGeocoder(data, backend, p)
+        assert gl.locations.loc[0, "geoid"] == "080310018001001"
+
+
+    def test_shared_cache(self, census_server, tmp_path):
+        """Results of another geocoder in a shared cache are not used"""
+        from bbd.geocoder import FakeBackend, GeocodeCache
+
+        url, requests = census_server
+        data = pd.DataFrame({"Address": ["1 Main St", "3 Oak Ave"],
+                             "City": ["Denver"] * 2, "State": ["CO"] * 2})
+
+        with GeocodeCache(tmp_path/"cache.sqlite") as cache:
+            LocationsGeocoder(data, FakeBackend(), tmp_path/"fake.tsv",
+                              cache = cache).run()
+
+            backend = CensusBatchBackend(url)
+            locations = LocationsGeocoder(data, backend, tmp_path/"census.tsv",
+                                          cache = cache).run()
+            assert len(requests) == 1
+            assert locations["geoid"].tolist() == ["080310018001001"] * 2
+
+            # Same benchmark and vintage: served from the cache
+            LocationsGeocoder(data, CensusBatchBackend(url),
+                              tmp_path/"census2.tsv", cache = cache).run()
+            assert len(requests) == 1
+
+            # Other vintage
+            backend = CensusBatchBackend(url, vintage = "Census2020_Current")
+            LocationsGeocoder(data, backend, tmp_path/"census3.tsv",
+                              cache = cache).run()
+            assert len(requests) == 2
+
+
+    def test_resume_with_other_backend(self, census_server, tmp_path):
+        """Files started without the geoid field cannot be resumed by
+        the CensusBatchBackend (and vice versa)"""
+        from bbd.geocoder import FakeBackend
+
+        url, requests = census_server
+        data = pd.DataFrame({"Address": ["1 Main St", "3 Oak Ave"],
+                             "City": ["Denver"] * 2, "State": ["CO"] * 2})
+        p = tmp_path/"test.tsv"
+
+        LocationsGeocoder(data, FakeBackend(), p, batch_size = 1).run(1)
+        with pytest.raises(ValueError):
+            LocationsGeocoder(data, CensusBatchBackend(url), p)
+
+        p = tmp_path/"census.tsv"
+        LocationsGeocoder(data, CensusBatchBackend(url), p, batch_size = 1).run(1)
+        with pytest.raises(ValueError):
+            LocationsGeocoder(data, FakeBackend(), p)
+
+        # The file was not changed
+        assert len(pd.read_csv(p, sep = "\t")) == 1
+        assert len(requests) == 1
@@ -0,0 +1,108 @@
+"""
+TESTS FOR bbd.geocoder.GeocodeCache
+"""
+
+import time
+
+import pandas as pd
+from geopy.location import Location
+
+from bbd import geocoder as gc
+from bbd.geocoder.cache import normalize_query
+
+valid_email = "test@bluebonnetdata.org"
+
+
+def fake_geocoder(calls):
+    """Geocode function that records its queries and finds no match for
+    queries mentioning "nowhere"."""
+    def geocode(query):
+        calls.append(query)
+        if "nowhere" in str(query).lower():
+            return None
+        return Location("Evans Hall, Berkeley", (37.8736211, -122.2576813),
+                        {"place_id": 1})
+    return geocode
+
+
+class TestGeocodeCache:
+
+    def test_normalize_query(self):
+        assert (normalize_query(" 123  Main St, Denver ")
+                == normalize_query("123 main st, DENVER"))
+        assert (normalize_query({"street": "1 A St", "city": "X",
+                                           "county": None})
+                == normalize_query({"city": "x", "street": "1 a st"}))
+        assert (normalize_query((37.87362111, -122.25768131))
+                == "37.8736211,-122.2576813")
+
+
+    def test_persistent(self, tmp_path):
+        calls = []
+        path = tmp_path / "cache.sqlite"
+
+        with gc.GeocodeCache(path) as cache:
+            geocode = gc.CachedGeocoder(fake_geocoder(calls), cache)
+            first = geocode("Evans Hall, Berkeley")
+            geocode("evans hall,  berkeley")
+            assert geocode("Nowhere") is None
+            assert geocode("nowhere") is None
+
+        # A new cache on the same file (e.g. a new session)
+        with gc.GeocodeCache(path) as cache:
+            geocode = gc.CachedGeocoder(fake_geocoder(calls), cache)
+            second = geocode("Evans Hall, Berkeley")
+            assert len(cache) == 2
+
+        assert calls == ["Evans Hall, Berkeley", "Nowhere"]
+        assert second.address == first.address
+        assert second.point == first.point
+        assert second.raw == {"place_id": 1}
+
+
+    def test_max_entries(self):
+        cache = gc.GeocodeCache(":memory:", max_entries=2)
+        for n in range(3):
+            cache.store(f"{n} Main St", Location(f"{n}", (1.0, 2.0), {}))
+            time.sleep(0.001)
+
+        assert len(cache) == 2
+        assert not cache.lookup("0 Main St")[0]
+        assert cache.lookup("2 Main St")[0]
+
+
+    def test_ttl_and_negative(self, tmp_path):
+        calls = []
+
+        cache = gc.GeocodeCache(":memory:", cache_negative=False)
+        geocode = gc.CachedGeocoder(fake_geocoder(calls), cache)
+        geocode("Nowhere")
+        geocode("Nowhere")
+        assert len(calls) == 2
+
+        cache = gc.GeocodeCache(":memory:", negative_ttl=0)
+        cache.store("Nowhere", None)
+        time.sleep(0.01)
+        assert cache.lookup("Nowhere") == (False, None)
+
+        cache.store((1.0, 2.0), Location("Somewhere", (1.0, 2.0), {}), "reverse")
+        assert cache.lookup((1.0, 2.0), "reverse")[0]
+        assert not cache.lookup((1.0, 2.0))[0]
+
+
+    def test_shared_by_LocationsGeocoder(self, tmp_path):
+        calls = []
+        cache = gc.GeocodeCache(tmp_path / "cache.sqlite")
+        data = pd.DataFrame({"Address": ["1 Main St", "1 Main St", "2 Oak Ave"],
+                             "City": ["Denver", "Denver", "Nowhere"]})
+
+        for run in range(2):
+            gl = gc.LocationsGeocoder(data, valid_email,
+                                      tmp_path / f"run{run}.tsv",
+                                      cache = cache)
+            gl._geocoder = fake_geocoder(calls)
+            gl.run()
+            assert len(gl.locations) == 3
+
+        # Each unique address only reaches the geocoder once, across runs
+        assert len(calls) == 2
@@ -410,6 +410,60 @@ class TestLocationsGeocoder:
         assert all(gl.locations.all())
 
 
+    def test_LocationsGeocoder_quoting(self, tmp_path):
+        """Tests that addresses with tabs, quotes and line breaks are 
+        saved to and resumed from disk intact.
+        """
+        from geopy.location import Location
+        from bbd.geocoder import FakeBackend
+
+        p = tmp_path/"test.csv"
+        addresses = ['1 "The Tab"\tSt', "2 O'Neil\nAve", "3 Plain St"]
+
+        def geocode(query):
+            if query.startswith("3"):
+                return None
+            return Location(query, (1.0, 2.0), {})
+
+        gl = gc.LocationsGeocoder(addresses, FakeBackend(geocode), p,
+                                  normalize = False)
+        gl._flush_every = 2
+        gl.run()
+
+        test = pd.read_csv(p, sep = "\t", index_col = 0)
+        assert test["address"].tolist() == addresses
+        assert len(test.columns) <= 4
+
+        resumed = gc.LocationsGeocoder(addresses, FakeBackend(geocode), p)
+        assert len(resumed._queue) == 0
+        assert resumed.locations["address"].tolist() == addresses
+        assert pd.isna(resumed.locations.loc[2, "latitude"])
+        assert gl.locations.equals(resumed.locations)
+
+
+    def test_LocationsGeocoder_many_batches(self, tmp_path):
+        """Tests that running more batches than the recursion limit
+        works and that queries are built from the rows' components.
+        """
+        import sys
+        from bbd.geocoder import FakeBackend
+
+        p = tmp_path/"test.csv"
+        n = sys.getrecursionlimit() + 10
+        data = pd.DataFrame({"Address": [f"{i} Main Street" for i in range(n)],
+                             "City": "Denver", "Zip5": 80202})
+        data.loc[1, "City"] = None
+
+        gl = gc.LocationsGeocoder(data, FakeBackend(), p, batch_size = 1)
+        gl.run()
+
+        assert len(gl._queue) == 0
+        assert len(gl.locations) == n
+        assert gl._address_query(1) == {"street": "1 MAIN ST",
+                                        "postalcode": "80202",
+                                        "country": "United States"}
+
+
     def test_LocationsGeocoder_reset(self, tmp_path):
         """
         """
@@ -0,0 +1,79 @@
+"""
+TESTS FOR bbd.geocoder.normalize
+"""
+
+import pandas as pd
+from geopy.location import Location
+
+from bbd import geocoder as gc
+from bbd.geocoder.normalize import (
+    normalize_addresses,
+    normalize_street,
+    normalize_zip5,
+)
+
+valid_email = "test@bluebonnetdata.org"
+
+
+class TestNormalize:
+
+    def test_normalize_street(self):
+        streets = pd.Series(["123 North Main Street", "123 MAIN ST.",
+                             "123 Lake Shore Drive", "12 North St",
+                             "9 Main Street South", None])
+        result = normalize_street(streets, gc.encode_street_address)
+        assert result.tolist() == ["123 N MAIN ST", "123 MAIN ST",
+                                   "123 LAKE SHORE DR", "12 NORTH ST",
+                                   "9 MAIN ST S", ""]
+
+
+    def test_encode_street_address_vectorized(self):
+        streets = ["123 Main St Apt 4", "456 Test Way", "420 Test Ave Unit 5"]
+        result = gc.encode_street_address(pd.Series(streets))
+        assert result.tolist() == [gc.encode_street_address(s)
+                                   for s in streets]
+
+
+    def test_normalize_zip5(self):
+        zips = pd.Series([2351, "80202-1234", "802021234", "2351.0", None])
+        assert normalize_zip5(zips).fillna("").tolist() == [
+            "02351", "80202", "80202", "02351", ""]
+
+
+    def test_normalize_addresses(self):
+        data = pd.DataFrame({"Address": ["123 Main Street Apt 4"],
+                             "City": [" san  francisco"],
+                             "Zip5": [94110],
+                             "Other": ["unchanged"]})
+        result = normalize_addresses(data, ["Address", "City", "Zip5"],
+                                     gc.encode_street_address)
+        assert result.iloc[0].tolist() == ["123 MAIN ST", "SAN FRANCISCO",
+                                           "94110", "unchanged"]
+
+        full = pd.DataFrame({0: ["123 North Main Street, Denver CO"]})
+        result = normalize_addresses(full, full_address = True)
+        assert result.iloc[0, 0] == "123 N MAIN ST, DENVER CO"
+
+
+    def test_LocationsGeocoder_dedup(self, tmp_path):
+        queries = []
+        def geocode(query):
+            queries.append(query)
+            return Location(query["street"], (1.0, 2.0), {})
+
+        data = pd.DataFrame({"Address": ["123 Main St Apt 4",
+                                         "123 MAIN STREET",
+                                         "9 Oak Ave"],
+                             "City": ["Denver", "denver", "Denver"],
+                             "Zip5": ["80202", "80202-1234", "80202"]})
+
+        gl = gc.LocationsGeocoder(data, valid_email, tmp_path/"test.tsv")
+        gl._geocoder = geocode
+        gl.run()
+
+        assert len(queries) == 2
+        assert queries[0] == {"street": "123 MAIN ST", "city": "DENVER",
+                              "postalcode": "80202",
+                              "country": "United States"}
+        assert len(gl.locations) == 3
+        assert gl.locations.loc[1, "address"] == "123 MAIN ST"
@@ -0,0 +1,105 @@
+"""
+TESTS FOR resuming bbd.geocoder.LocationsGeocoder from its progress bitmap
+"""
+
+import pandas as pd
+import pytest
+
+from bbd import geocoder as gc
+from bbd.geocoder import FakeBackend
+from bbd.geocoder.progress import ProgressBitmap
+
+
+def make_addresses(n):
+    return pd.DataFrame({"Address": [f"{i} Main St" for i in range(n)],
+                         "City": "Denver", "State": "CO"},
+                        index = pd.Index([f"id{i}" for i in range(n)],
+                                         name = "voter_id"))
+
+
+def test_ProgressBitmap(tmp_path):
+    p = tmp_path/"test.progress"
+    progress = ProgressBitmap.create(p, 21)
+
+    assert len(progress) == 0
+    assert progress.remaining().tolist() == list(range(21))
+
+    progress.mark([0, 3, 8, 20, 3])
+    progress.flush()
+
+    reopened = ProgressBitmap.open(p, 21)
+    assert len(reopened) == 4
+    assert 20 in reopened and 3 in reopened and 4 not in reopened
+    assert reopened.remaining().tolist() == [i for i in range(21)
+                                             if i not in (0, 3, 8, 20)]
+
+    with pytest.raises(ValueError):
+        ProgressBitmap.open(p, 22)
+    with pytest.raises(ValueError):
+        ProgressBitmap.open(p, 21, b"other data")
+
+
+def test_LocationsGeocoder_resume(tmp_path):
+    """Resuming only geocodes the remaining rows"""
+    p = tmp_path/"test.tsv"
+    data = make_addresses(250)
+
+    gl = gc.LocationsGeocoder(data, FakeBackend(), p, batch_size = 100)
+    gl.run(num_batches = 1)
+
+    backend = FakeBackend()
+    resumed = gc.LocationsGeocoder(data, backend, p, batch_size = 100)
+    assert len(resumed._queue) == 150
+    assert resumed.curr_batch == 2
+
+    resumed.run()
+    assert backend.calls == 150
+    assert len(resumed._queue) == 0
+
+    assert resumed.locations.index.equals(data.index)
+    expected = gc.LocationsGeocoder(data, FakeBackend(), tmp_path/"all.tsv")
+    pd.testing.assert_frame_equal(expected.run(), resumed.locations)
+
+
+def test_LocationsGeocoder_resume_without_progress(tmp_path):
+    """Progress is rebuilt from the results file if the bitmap is missing"""
+    p = tmp_path/"test.tsv"
+    data = make_addresses(250)
+
+    gl = gc.LocationsGeocoder(data, FakeBackend(), p, batch_size = 100)
+    gl.run(num_batches = 2)
+    (tmp_path/"test.tsv.progress").unlink()
+
+    resumed = gc.LocationsGeocoder(data, FakeBackend(), p, batch_size = 100)
+    assert list(resumed._queue) == list(range(200, 250))
+    assert (tmp_path/"test.tsv.progress").exists()
+
+    resumed = gc.LocationsGeocoder(data, FakeBackend(), p, batch_size = 100)
+    assert len(resumed._queue) == 50
+
+
+def test_LocationsGeocoder_resume_other_data(tmp_path):
+    """A bitmap of other data with as many rows is not used"""
+    p = tmp_path/"test.tsv"
+    data = make_addresses(250)
+
+    gl = gc.LocationsGeocoder(data.iloc[:100], FakeBackend(), p)
+    gl.run()
+
+    # Same length, first 100 rows (by position) geocoded under other labels
+    other = data.iloc[100:200]
+    resumed = gc.LocationsGeocoder(other, FakeBackend(), p)
+    assert len(resumed._queue) == 100
+
+
+def test_LocationsGeocoder_resume_duplicate_labels(tmp_path):
+    p = tmp_path/"test.tsv"
+    data = make_addresses(6)
+    data.index = ["a", "a", "b", "b", "c", "c"]
+
+    gl = gc.LocationsGeocoder(data, FakeBackend(), p, batch_size = 2)
+    gl.run(num_batches = 2)
+    (tmp_path/"test.tsv.progress").unlink()
+
+    resumed = gc.LocationsGeocoder(data, FakeBackend(), p, batch_size = 2)
+    assert list(resumed._queue) == [4, 5]
@@ -0,0 +1,73 @@
+"""
+TESTS FOR bbd.geocoder.TigerGeocoder
+"""
+
+from math import isclose
+
+import pandas as pd
+import shapefile
+
+from bbd import geocoder as gc
+from bbd.census.get_shapefile import shapefile_urls, ADDRESS_FEATURES
+
+
+def make_addrfeat(path):
+    """Two segments of Main St (100-198 and 200-298) and one of Oak Ave"""
+    with shapefile.Writer(str(path)) as w:
+        w.shapeType = shapefile.POLYLINE
+        for field in ["TLID", "FULLNAME", "LFROMHN", "LTOHN", "RFROMHN",
+                      "RTOHN", "ZIPL", "ZIPR"]:
+            w.field(field, "C")
+
+        w.line([[[-105.0, 39.0], [-104.9, 39.0]]])
+        w.record("1", "N Main St", "101", "199", "100", "198", "80202", "80202")
+        w.line([[[-104.9, 39.0], [-104.8, 39.0]]])
+        w.record("2", "N Main St", "201", "299", "200", "298", "80202", "80203")
+        w.line([[[-105.0, 39.0], [-105.0, 39.1]]])
+        w.record("3", "Oak Ave", "", "", "2", "10", "", "80205")
+    return path
+
+
+class TestTigerGeocoder:
+
+    def test_geocode(self, tmp_path):
+        geocode = gc.TigerGeocoder(make_addrfeat(tmp_path / "addrfeat"))
+        assert len(geocode) == 5
+
+        location = geocode({"street": "150 North Main Street",
+                            "postalcode": "80202"})
+        assert location.address == "150 N MAIN ST, 80202"
+        assert isclose(location.latitude, 39.0)
+        assert isclose(location.longitude, -105.0 + 0.1 * 50 / 98)
+        assert location.raw["side"] == "R"
+
+        location = geocode("251 N Main St, Denver, CO 80202")
+        assert location.raw["tlid"] == "2"
+        assert location.raw["side"] == "L"
+
+        location = geocode("6 Oak Avenue")
+        assert isclose(location.latitude, 39.05)
+
+        assert geocode("7 Oak Ave") is None # Wrong side of the street
+        assert geocode("500 N Main St") is None
+        assert geocode("Main St") is None
+
+
+    def test_LocationsGeocoder(self, tmp_path):
+        geocode = gc.TigerGeocoder(make_addrfeat(tmp_path / "addrfeat"))
+        data = pd.DataFrame({"Address": ["150 N Main St Apt 2", "6 Oak Ave",
+                                         "1 Nowhere Rd"],
+                             "City": ["Denver"] * 3,
+                             "Zip5": ["80202", "80205", "80202"]})
+
+        gl = gc.LocationsGeocoder(data, geocode, tmp_path / "test.tsv")
+        locations = gl.run()
+
+        assert locations["latitude"].notna().tolist() == [True, True, False]
+
+
+    def test_shapefile_url(self):
+        urls = shapefile_urls("08", 2019, "031")
+        assert urls[ADDRESS_FEATURES] == ("https://www2.census.gov/geo/tiger/"
+            "TIGER2019/ADDRFEAT/tl_2019_08031_addrfeat.zip")
+        assert ADDRESS_FEATURES not in shapefile_urls("08", 2019)
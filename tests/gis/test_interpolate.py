@@ -0,0 +1,84 @@
+from math import isclose
+
+import shapefile
+
+from bbd import gis
+from bbd.working_directory import working_directory
+
+
+def _write_rectangles(path, key, squares):
+    """Write a shapefile of rectangles given as {name: (x, y, width, height)}"""
+    with shapefile.Writer(str(path)) as w:
+        w.shapeType = shapefile.POLYGON
+        w.field(key, "C")
+        for name, (x, y, width, height) in squares.items():
+            w.poly([[[x, y], [x, y + height], [x + width, y + height], [x + width, y]]])
+            w.record(name)
+    return path
+
+
+def _crosswalk(tmp_path, cache=False):
+    # Two sources side by side; "t1" covers all of "a" and half of "b",
+    # "t2" covers the other half of "b", "t3" only touches "b".
+    source = _write_rectangles(
+        tmp_path / "source", "GEOID", {"a": (0, 0, 10, 10), "b": (10, 0, 10, 10)}
+    )
+    target = _write_rectangles(
+        tmp_path / "target",
+        "precinct",
+        {
+            "t1": (0, 0, 15, 10),
+            "t2": (15, 0, 5, 10),
+            "t3": (20, 0, 5, 10),
+            "t4": (100, 0, 1, 1),
+        },
+    )
+    return gis.Crosswalk.from_shapefiles(
+        source, "GEOID", target, "precinct", cache=cache
+    )
+
+
+DATA = {
+    "GEOID": ["b", "a"],
+    "B01003_001E": ["200", "100"],
+    "B19013_001E": ["1000", "4000"],
+    "B25001_001E": ["-666666666", "20"],
+}
+
+
+def test_extensive(tmp_path):
+    result = _crosswalk(tmp_path).interpolate(
+        DATA, "GEOID", ["B01003_001E", "B25001_001E"]
+    )
+
+    assert result["target"] == ["t1", "t2", "t3", "t4"]
+    assert result["B01003_001E"][:2] == [200, 100]
+    assert result["B01003_001E"][2:] == [None, None]  # No overlapping sources
+    assert result["B25001_001E"][:2] == [None, None]  # "b" is missing
+
+
+def test_intensive(tmp_path):
+    crosswalk = _crosswalk(tmp_path)
+
+    by_area = crosswalk.interpolate(DATA, "GEOID", ["B19013_001E"], extensive=False)
+    assert isclose(by_area["B19013_001E"][0], (4000 * 100 + 1000 * 50) / 150)
+    assert isclose(by_area["B19013_001E"][1], 1000)
+
+    by_population = crosswalk.interpolate(
+        DATA, "GEOID", ["B19013_001E"], extensive=False, population="B01003_001E"
+    )
+    assert isclose(by_population["B19013_001E"][0], (4000 * 100 + 1000 * 100) / 200)
+
+
+def test_cache(tmp_path):
+    previous = working_directory.path
+    working_directory.path = tmp_path
+    try:
+        first = _crosswalk(tmp_path, cache=True)
+        assert len(list(tmp_path.glob("crosswalk_source_target_*.npz"))) == 1
+
+        second = _crosswalk(tmp_path, cache=True)
+        assert second.overlap.tolist() == first.overlap.tolist()
+        assert second.target_ids.tolist() == first.target_ids.tolist()
+    finally:
+        working_directory.path = previous
@@ -26,3 +26,30 @@ def test_utils():
     assert withinShape[1] == "poly1"  # Inside shape
     assert withinShape[2] == "poly1"  # On shape boundary
     assert withinShape[3] == "poly1"  # On shape vertex
+
+
+def test_assign_shapes():
+
+    path = tempfile.mktemp(suffix="")  # no extension
+
+    with shapefile.Writer(path) as w:
+        w.shapeType = shapefile.POLYGON
+        w.field("test_name", "C")  # text field
+
+        w.poly([[[0, 0], [0, 100], [100, 100], [100, 0]]])  # poly 1, a square
+        w.record("poly1")
+
+        w.poly([[[50, 50], [50, 200], [200, 200], [200, 50]]])  # poly 2, overlaps 1
+        w.record("poly2")
+
+    longitudes = [-10, 10, 100, 150, None]
+
+    latitudes = [-10, 10, 100, 150, None]
+
+    shapes = gis.assign_shapes(latitudes, longitudes, path, "test_name")
+
+    assert shapes[0] is None  # Outside shapes
+    assert shapes[1] == "poly1"  # Inside shape
+    assert shapes[2] == "poly1"  # In both shapes, first shape wins
+    assert shapes[3] == "poly2"  # Inside second shape
+    assert shapes[4] is None  # Missing coordinates
@@ -0,0 +1,123 @@
+import json
+
+from bbd import census, fec
+from bbd.warehouse import Warehouse
+
+
+def _warehouse(tmp_path):
+    return Warehouse(tmp_path / "bbd.sqlite")
+
+
+def test_write_acs(tmp_path):
+    with _warehouse(tmp_path) as warehouse:
+        for year, population in ((2017, "5436519"), (2018, "5531141")):
+            table = warehouse.write_acs(
+                {"NAME": ["Colorado"], "B01003_001E": [population], "state": ["08"]},
+                "acs/acs5",
+                year,
+                "state",
+            )
+
+        assert table == "acs_acs5_state"
+        assert warehouse.tables() == ["acs_acs5_state"]
+        assert warehouse.query(
+            "SELECT year, state, B01003_001E FROM acs_acs5_state ORDER BY year"
+        ) == {
+            "year": [2017, 2018],
+            "state": ["08", "08"],  # Leading zero is kept
+            "B01003_001E": [5436519, 5531141],
+        }
+
+
+def test_acs_upsert(tmp_path):
+    with _warehouse(tmp_path) as warehouse:
+        warehouse.write_acs(
+            {"B01003_001E": ["1"], "state": ["08"], "county": ["001"]},
+            "acs/acs5",
+            2018,
+            "county",
+        )
+        # Re-writing a row updates it; new variables become new columns
+        warehouse.write_acs(
+            {"B01003_001E": ["2"], "B19013_001E": ["3.5"], "state": ["08"], "county": ["001"]},
+            "acs/acs5",
+            2018,
+            "county",
+        )
+
+        result = warehouse.query("SELECT * FROM acs_acs5_county")
+        assert result["B01003_001E"] == [2]
+        assert result["B19013_001E"] == [3.5]
+
+
+def test_write_fec(tmp_path):
+    results = [
+        {"sub_id": "1", "contributor_zip": "02134", "amount": 10.0, "committee": {"id": "C1"}},
+        {"sub_id": "2", "contributor_zip": "80202", "amount": 5},
+    ]
+
+    with _warehouse(tmp_path) as warehouse:
+        table = warehouse.write_fec(results, "/schedules/schedule_a/")
+        warehouse.write_fec(results[:1], "/schedules/schedule_a/")  # Duplicate
+
+        assert table == "fec_schedules_schedule_a"
+
+        result = warehouse.query(
+            f"SELECT * FROM {table} WHERE amount > ? ORDER BY sub_id", [1]
+        )
+        assert result["sub_id"] == ["1", "2"]
+        assert result["contributor_zip"] == ["02134", "80202"]
+        assert json.loads(result["committee"][0]) == {"id": "C1"}
+        assert result["committee"][1] is None
+
+
+def test_fec_key_does_not_depend_on_first_write(tmp_path):
+    with _warehouse(tmp_path) as warehouse:
+        # First records have no sub_id (e.g. a totals endpoint)
+        table = warehouse.write_fec([{"amount": 1}], "schedules/schedule_a")
+        warehouse.write_fec([{"sub_id": "1", "amount": 2}], "schedules/schedule_a")
+        warehouse.write_fec([{"sub_id": "1", "amount": 3}], "schedules/schedule_a")
+
+        assert warehouse.primary_key(table) == ["sub_id"]
+        assert warehouse.query(f"SELECT sub_id, amount FROM {table} ORDER BY amount") == {
+            "sub_id": [None, "1"],
+            "amount": [1, 3],
+        }
+
+
+def test_write_existing_table_without_key(tmp_path):
+    with _warehouse(tmp_path) as warehouse:
+        warehouse.write("fec_old", {"amount": [1]})
+        warehouse.write("fec_old", {"sub_id": ["1"], "amount": [2]}, ["sub_id"])
+
+        assert warehouse.query("SELECT amount FROM fec_old") == {"amount": [1, 2]}
+
+
+def test_get_acs_warehouse(census_api, tmp_path):
+    census_api.respond = lambda call: [["B01003_001E", "state"], ["5531141", "08"]]
+
+    with _warehouse(tmp_path) as warehouse:
+        census.get_acs(census.Geography.STATE, "B01003_001E", 2018, warehouse=warehouse)
+
+        assert warehouse.query("SELECT * FROM acs_acs5_state") == {
+            "year": [2018],
+            "B01003_001E": [5531141],
+            "state": ["08"],
+        }
+
+
+def test_get_fec_warehouse(fake_requests, monkeypatch, tmp_path):
+    monkeypatch.setattr(fec.api_key, "_key", "MyApiKey")
+    fake_requests.respond = lambda call: {
+        "results": [{"sub_id": "1", "contributor_zip": "02134"}],
+        "pagination": {},
+    }
+
+    with _warehouse(tmp_path) as warehouse:
+        fec.get_fec("schedules/schedule_a", {}, warehouse=warehouse)
+        fec.get_fec("schedules/schedule_a", {}, warehouse=warehouse)
+
+        assert warehouse.query("SELECT * FROM fec_schedules_schedule_a") == {
+            "sub_id": ["1"],
+            "contributor_zip": ["02134"],
+        }